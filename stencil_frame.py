@@ -23,16 +23,3035 @@
 #   simple pocket goes right to the edges.
 
 from EZCAD3 import *
+import argparse
+import array
+import atexit
+import fractions
+import gc
+import imp
+import math
+import os
+import re
+import sys
+import time
+
+# The shared *Color*, *Material* and *HoleFeature* objects (see *color_get*(),
+# *material_get*() and *hole_feature_get*()):
+colors = {}
+hole_features = {}
+materials = {}
+
+# The red, green and blue of each *Color* name for the glTF scene (see *frame_gltf_write*()):
+color_rgbs = {"cyan": (0.0, 1.0, 1.0), "dark_green": (0.0, 0.39, 0.0), "lime": (0.0, 1.0, 0.0),
+  "purple": (0.5, 0.0, 0.5), "tan": (0.82, 0.71, 0.55), "yellow": (1.0, 1.0, 0.0)}
+
+# The *ezcad* object of a *frame_generate*() worker process (see *frame_job_start*()):
+job_ezcads = []
+
+# The operation profile maps a (stack, operation, comment) key to a [count, seconds,
+# allocations] list, where allocations is only a rough proxy (see
+# *BasePart.operation_profile*() and *profile_write*()):
+operation_profiles = {}
+
+# The stencil variants timed by *frame_benchmark*() as (name, dx, dy, thickness, fold_amount):
+benchmark_variants = (
+  ("small",   "10cm", "8cm",  "0.12mm", "1/4in"),
+  ("default", "15cm", "10cm", "0.12mm", "1/4in"),
+  ("large",   "20cm", "15cm", "0.15mm", "1/4in"))
+
+# The tools and machine speeds assumed by the operation scheduler (see *BasePart.tool_get*()):
+drills = {("#4-40", "close"): "#32_Drill", ("#4-40", "thread"): "#43_Drill",
+  ("#6-32", "close"): "#27_Drill", ("#6-32", "thread"): "#36_Drill"}
+end_mill_diameters = ("1/2in", "3/8in", "1/4in", "1/8in", "1/16in")
+rapid_speed = 2540.0 / 60.0  # Millimeters per second (i.e. 100 inches per minute.)
+tool_change_time = 30.0      # Seconds per manual tool change.
+
+# The HDPE cutting values assumed by the estimator (see *BasePart.estimate_get*()).  Drills
+# map to their diameter and end mills to their (feed, depth of cut); all in millimeters and
+# millimeters per second:
+drill_diameters = {"#27_Drill": 3.658, "#32_Drill": 2.946, "#36_Drill": 2.705,
+  "#43_Drill": 2.261}
+drill_feed = 5.0
+end_mill_feeds = {"1/2in_End_Mill": (30.0, 3.0), "3/8in_End_Mill": (25.0, 2.5),
+  "1/4in_End_Mill": (20.0, 2.0), "1/8in_End_Mill": (12.0, 1.0), "1/16in_End_Mill": (6.0, 0.5)}
+retract_height = 5.0
+tooling_plate_tool = "#36_Drill"
+
+# The gap below which two *Part*'s or a *Part* and a fastener are reported as close (see
+# *frame_clearance_report*()), in millimeters:
+clearance_minimum = 1.0
+
+# The saw kerf and the time per saw cut assumed by the cut list (see *bom_report*()):
+saw_kerf = "1/8in"
+saw_cut_time = 30.0
+
+# The tooling plate hole pitch and the gap between nested stock (see *frame_nest*()):
+plate_pitch = "1/2in"
+plate_spacing = "1/4in"
 
 def main():
-    # Create *ezcad* object for EZCAD 3.0:
-    ezcad = EZCAD3(0)
+    # Parse the command line arguments:
+    options = options_parse(sys.argv[1:])
+    if options.profile != None:
+        atexit.register(profile_write, options.profile)
+
+    # Only create the *ezcad* object (with its tool tables) when something is rendered (a
+    # *--viewer* needs wrl unless there is a glTF scene to view).  It is then shared by every
+    # build of this run:
+    ezcad = None
+    if not options.time_startup and (options.benchmark != None or "cnc" in options.outputs or
+      "wrl" in options.outputs or (options.viewer != None and not "gltf" in options.outputs)):
+        ezcad = EZCAD3(0)
+
+    # Report the start up time, benchmark, sweep the design parameters, build every variant
+    # in the *batch* file, keep rebuilding the frame as it is edited, or just build the one
+    # frame:
+    if options.time_startup:
+        startup_report()
+    elif options.benchmark != None:
+        if not frame_benchmark(options, ezcad):
+            sys.exit(1)
+    elif options.sweep != None:
+        frame_sweep(options, ezcad)
+    elif options.batch != None:
+        frame_batch_build(options, ezcad)
+    elif options.watch:
+        frame_watch(options, ezcad)
+    else:
+        frame_build(options, ezcad)
+
+def artifact_owner(path, names):
+    """ Return the name from *names* that owns the artifact at *path* (the longest name that
+        prefixes its file name) or *None*.
+    """
+
+    # Compare names with everything but letters and digits stripped:
+    assert isinstance(path, str)
+    assert isinstance(names, list)
+    base_name = "".join([c for c in os.path.basename(path).lower() if c.isalnum()])
+    owner = None
+    owner_key = ""
+    for name in names:
+        key = "".join([c for c in name.lower() if c.isalnum()])
+        if base_name.startswith(key) and len(key) > len(owner_key):
+            owner = name
+            owner_key = key
+    return owner
+
+def artifacts_merge(scratch_directory, output_directory, names, merge_names):
+    """ Copy the artifacts in *scratch_directory* owned by the *Part*'s in *merge_names* into
+        *output_directory* and return a dictionary from each name to its list of artifacts.
+    """
+
+    # Check argument types:
+    assert isinstance(scratch_directory, str)
+    assert isinstance(output_directory, str)
+    assert isinstance(names, list)
+    assert isinstance(merge_names, list)
+
+    import shutil
+
+    # Walk *scratch_directory* in a deterministic order and copy the selected artifacts:
+    artifacts = dict([(name, []) for name in merge_names])
+    for directory, sub_directories, file_names in os.walk(scratch_directory):
+        sub_directories.sort()
+        for file_name in sorted(file_names):
+            scratch_path = os.path.join(directory, file_name)
+            path = os.path.relpath(scratch_path, scratch_directory)
+            owner = artifact_owner(path, names) or "Stencil_Frame"
+            if owner in artifacts:
+                output_path = os.path.join(output_directory, path)
+                if not os.path.isdir(os.path.dirname(output_path)):
+                    os.makedirs(os.path.dirname(output_path))
+                with open(scratch_path, "rb") as scratch_file:
+                    with AtomicFile(output_path, "wb") as output_file:
+                        shutil.copyfileobj(scratch_file, output_file)
+                shutil.copystat(scratch_path, output_path)
+                artifacts[owner].append(path)
+    return artifacts
+
+def bar_pack(items, bar_length, kerf):
+    """ Pack *items* (a list of (*key*, *length*) pieces) into *bar_length* bars allowing *kerf*
+        per cut and return one list of (*key*, *offset*) per bar.
+    """
+
+    # Check argument types:
+    assert isinstance(items, list)
+
+    # Put each piece, longest first, into the first bar with room for it.  A bar is a
+    # [*placements*, *next_offset*] list:
+    bars = []
+    for key, length in sorted(items, key=lambda item: -item[1]):
+        assert length <= bar_length, "{0} is longer than the bar".format(key)
+        for bar in bars:
+            if bar[1] + length <= bar_length:
+                bar[0].append((key, bar[1]))
+                bar[1] += length + kerf
+                break
+        else:
+            bars.append([[(key, 0.0)], length + kerf])
+    return [bar[0] for bar in bars]
+
+def benchmark_read(path):
+    """ Return the benchmark results (a list of (*variant*, *phase*, *seconds*) tuples) read
+        from the .json or .csv file at *path* (see *benchmark_write*().)
+    """
+
+    import csv
+    import json
+
+    # Read either format:
+    assert isinstance(path, str)
+    with open(path) as results_file:
+        if path.endswith(".csv"):
+            rows = list(csv.DictReader(results_file))
+        else:
+            rows = json.load(results_file)["results"]
+    return [(str(row["variant"]), str(row["phase"]), float(row["seconds"])) for row in rows]
+
+def benchmark_write(path, results):
+    """ Write the benchmark *results* (a list of (*variant*, *phase*, *seconds*) tuples) to
+        *path* as CSV when it ends in ".csv" and as JSON otherwise.
+    """
+
+    # Check argument types:
+    assert isinstance(path, str)
+    assert isinstance(results, list)
+
+    import csv
+    import json
+
+    # Write the rows out:
+    rows = [{"variant": variant, "phase": phase, "seconds": seconds}
+      for variant, phase, seconds in results]
+    with AtomicFile(path) as results_file:
+        if path.endswith(".csv"):
+            writer = csv.DictWriter(results_file, ["variant", "phase", "seconds"])
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            json.dump({"results": rows}, results_file, indent=1, sort_keys=True)
+
+def bom_report(bom, options):
+    """ Print the bill of materials and the cut list for *bom* (see *frame_bom_collect*()),
+        grouped by material and thickness.
+    """
+
+    # Check argument types:
+    assert isinstance(bom, tuple)
+
+    # Group the pieces by material and thickness:
+    pieces, screws, holes = bom
+    sheet_dx, sheet_dy = [length_parse(text).millimeters() for text in options.bom_sheet.split(",")]
+    bar_width, bar_length = (0.0, 0.0) if options.bom_bar == None else [
+      length_parse(text).millimeters() for text in options.bom_bar.split(",")]
+    kerf = length_parse(saw_kerf).millimeters()
+    groups = {}
+    for label, material_name, thickness, dx, dy in pieces:
+        groups.setdefault((material_name, round(thickness, 3)), []).append((label, dx, dy))
+
+    # Cut each group from bars and sheets:
+    total_cuts = 0
+    for material_name, thickness in sorted(groups.keys()):
+        group = groups[(material_name, thickness)]
+        print("{0} {1:.3f}in ({2:.2f}mm) thick: {3} pieces".format(material_name,
+          thickness / 25.4, thickness, len(group)))
+        bar_items = [(label, max(dx, dy)) for label, dx, dy in group if min(dx, dy) <= bar_width]
+        sheet_items = [(label, dx, dy) for label, dx, dy in group if min(dx, dy) > bar_width]
+
+        # Cut the narrow pieces to length from bars (one cut per piece):
+        if len(bar_items) > 0:
+            bars = bar_pack(bar_items, bar_length, kerf)
+            used = sum([length for label, length in bar_items])
+            print("  {0} bars of {1:.1f}mm x {2:.1f}mm, {3:.0f}% yield, {4} cuts".format(
+              len(bars), bar_width, bar_length, 100.0 * used / (len(bars) * bar_length),
+              len(bar_items)))
+            for index, bar in enumerate(bars):
+                print("    Bar {0}: {1}".format(index + 1, ", ".join(
+                  ["{0} at {1:.1f}".format(label, offset) for label, offset in bar])))
+            total_cuts += len(bar_items)
+
+        # Rip each sheet into one strip per shelf and cross cut the pieces off the strips:
+        if len(sheet_items) > 0:
+            sheets = nest_pack(sheet_items, sheet_dx, sheet_dy, kerf, 0.0, None)
+            used = sum([dx * dy for label, dx, dy in sheet_items])
+            cuts = sum([len(set([y for label, x, y, rotated in sheet])) + len(sheet)
+              for sheet in sheets])
+            print("  {0} sheets of {1:.1f}mm x {2:.1f}mm, {3:.0f}% yield, {4} cuts".format(
+              len(sheets), sheet_dx, sheet_dy, 100.0 * used / (len(sheets) * sheet_dx * sheet_dy),
+              cuts))
+            for index, sheet in enumerate(sheets):
+                print("    Sheet {0}: {1}".format(index + 1, ", ".join(
+                  ["{0} at ({1:.1f}, {2:.1f}){3}".format(label, x, y, " turned" if rotated else "")
+                  for label, x, y, rotated in sheet])))
+            total_cuts += cuts
+    print("Saw time: {0} cuts, {1:.1f} minutes".format(total_cuts,
+      total_cuts * saw_cut_time / 60.0))
+
+    # Count the hardware:
+    for kind, length in sorted(screws.keys()):
+        print("Screw {0} x {1:.3f}in: {2}".format(kind, length, screws[(kind, length)]))
+    for kind, mode in sorted(holes.keys()):
+        print("Hole {0} {1}: {2}".format(kind, mode, holes[(kind, mode)]))
+
+def box_mesh_get(boxes):
+    """ Return the (*vertices*, *triangles*) mesh of the (*low*, *high*) millimeter *boxes*,
+        with 8 vertices and 12 outward facing triangles per box.
+    """
+
+    # Check argument types:
+    assert isinstance(boxes, list)
+
+    # Vertex *i* + 2*j* + 4*k* of a box is at its high X, Y and Z when *i*, *j* and *k* are 1:
+    vertices = []
+    triangles = []
+    for low, high in boxes:
+        base = len(vertices)
+        vertices.extend([((low, high)[i][0], (low, high)[j][1], (low, high)[k][2])
+          for k in (0, 1) for j in (0, 1) for i in (0, 1)])
+        for a, b, c, d in ((0, 4, 6, 2), (1, 3, 7, 5), (0, 1, 5, 4), (2, 6, 7, 3), (0, 2, 3, 1),
+          (4, 5, 7, 6)):
+            triangles.append((base + a, base + b, base + c))
+            triangles.append((base + a, base + c, base + d))
+    return vertices, triangles
+
+def box_subtract(low, high, cutter_low, cutter_high):
+    """ Return the list of (*low*, *high*) boxes left of the *low* to *high* box after removing
+        the *cutter_low* to *cutter_high* box.
+    """
+
+    # Nothing is removed when the boxes do not overlap:
+    if not all([cutter_low[axis] < high[axis] and low[axis] < cutter_high[axis]
+      for axis in range(3)]):
+        return [(low, high)]
+
+    # Slice off the part below and above the cutter along each axis in turn:
+    pieces = []
+    low, high = list(low), list(high)
+    for axis in range(3):
+        if low[axis] < cutter_low[axis]:
+            piece_high = list(high)
+            piece_high[axis] = cutter_low[axis]
+            pieces.append((tuple(low), tuple(piece_high)))
+            low[axis] = cutter_low[axis]
+        if cutter_high[axis] < high[axis]:
+            piece_low = list(low)
+            piece_low[axis] = cutter_high[axis]
+            pieces.append((tuple(piece_low), tuple(high)))
+            high[axis] = cutter_high[axis]
+    return pieces
+
+def color_get(name):
+    """ Return the shared *Color* named *name*.  *Color* objects are created once and reused
+        by every *Part*, pass and variant.
+    """
+
+    # Create the *Color* on first use:
+    assert isinstance(name, str)
+    color = colors.get(name)
+    if color == None:
+        color = Color(name)
+        colors[name] = color
+    return color
+
+def cylinder_mesh_get(diameter, length, sides=8):
+    """ Return the (*vertices*, *triangles*) mesh of a *sides* sided millimeter cylinder of
+        *diameter* that runs up the Z axis from the origin to *length*.
+    """
+
+    # Vertices 0 to *sides*-1 are the bottom ring, then the top ring and the two cap centers:
+    radius = diameter / 2.0
+    ring = [(radius * math.cos(2.0 * math.pi * index / sides),
+      radius * math.sin(2.0 * math.pi * index / sides)) for index in range(sides)]
+    vertices = ([(x, y, 0.0) for x, y in ring] + [(x, y, length) for x, y in ring] +
+      [(0.0, 0.0, 0.0), (0.0, 0.0, length)])
+    triangles = []
+    for index in range(sides):
+        next_index = (index + 1) % sides
+        triangles.append((index, next_index, sides + next_index))
+        triangles.append((index, sides + next_index, sides + index))
+        triangles.append((2 * sides, next_index, index))
+        triangles.append((2 * sides + 1, sides + index, sides + next_index))
+    return vertices, triangles
+
+def frame_batch_build(options, ezcad):
+    """ Build every stencil variant listed in the *options.batch* CSV file, each into its own
+        sub-directory of *options.batch_directory*.
+    """
+
+    # Check argument types:
+    assert ezcad == None or isinstance(ezcad, EZCAD3)
+
+    import csv
+
+    # Read in all of the variants before building anything so that typos are caught early:
+    with open(options.batch) as batch_file:
+        rows = list(csv.DictReader(batch_file))
+    names = set()
+    for row in rows:
+        name = row["name"].strip()
+        assert name != "" and not name in names, "Bad or duplicate variant name '{0}'".format(name)
+        names.add(name)
+        for column in ("dx", "dy", "thickness", "fold_amount"):
+            length_parse(row[column])
+
+    # Build each variant from inside its own directory, collecting one bill of materials for
+    # all of them:
+    current_directory = os.getcwd()
+    bom = ([], {}, {})
+    for row in rows:
+        variant_options = argparse.Namespace(**vars(options))
+        variant_options.stencil_dx        = row["dx"]
+        variant_options.stencil_dy        = row["dy"]
+        variant_options.stencil_thickness = row["thickness"]
+        variant_options.stencil_fold      = row["fold_amount"]
+        variant_options.outputs           = [output for output in options.outputs
+          if output != "bom"]
+        if "bom" in options.outputs:
+            stencil_frame = frame_create(variant_options)
+            frame_offline_solve(stencil_frame)
+            frame_bom_collect(stencil_frame, row["name"].strip(), options.bom_copies, bom)
+        directory = os.path.join(current_directory, options.batch_directory, row["name"].strip())
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        start_time = time.time()
+        os.chdir(directory)
+        try:
+            frame_build(variant_options, ezcad)
+        finally:
+            os.chdir(current_directory)
+        print("Variant {0} built in {1:.2f}s".format(row["name"].strip(),
+          time.time() - start_time))
+    if "bom" in options.outputs:
+        bom_report(bom, options)
+
+def frame_benchmark(options, ezcad):
+    """ Time the build phases of each of the *benchmark_variants* with *ezcad* and return *False*
+        when any phase is slower than the *options.benchmark_baseline* file allows.
+    """
+
+    # Check argument types:
+    assert isinstance(ezcad, EZCAD3)
+
+    import shutil
+    import subprocess
+
+    # Time the module import once since it does not depend on the variant:
+    directory = os.path.dirname(os.path.abspath(__file__))
+    command = [sys.executable, "-c",
+      "import time; start = time.time(); import stencil_frame; print(time.time() - start)"]
+    import_time = float(subprocess.check_output(command, cwd=directory).split()[-1])
+    results = [("all", "import", import_time)]
+
+    # Time each of the variants:
+    for name, dx, dy, thickness, fold_amount in benchmark_variants:
+        variant_options = argparse.Namespace(**vars(options))
+        variant_options.stencil_dx        = dx
+        variant_options.stencil_dy        = dy
+        variant_options.stencil_thickness = thickness
+        variant_options.stencil_fold      = fold_amount
+        variant_options.trace_solve       = False
+        variant_options.schedule_report   = False
+
+        # Time the creation and the offline solve:
+        start_time = time.time()
+        stencil_frame = frame_create(variant_options)
+        results.append((name, "init", time.time() - start_time))
+        start_time = time.time()
+        frame_offline_solve(stencil_frame)
+        results.append((name, "offline_solve", time.time() - start_time))
+
+        # Time a full *process*() and break out its *construct*() passes:
+        names = [part.part_name for part in stencil_frame.parts_get()]
+        start_time = time.time()
+        stencil_frame, scratch_directory = frame_process(names, variant_options, ezcad)
+        results.append((name, "process", time.time() - start_time))
+        shutil.rmtree(scratch_directory)
+        parts = [stencil_frame] + stencil_frame.parts_get()
+        for index in range(max([len(part.pass_records) for part in parts])):
+            results.append((name, "pass_{0}".format(index + 1),
+              sum([part.pass_records[index][0] for part in parts
+              if index < len(part.pass_records)])))
+
+        # Time each *Part* on its own against a build with every *Part* inactive:
+        start_time = time.time()
+        stencil_frame, scratch_directory = frame_process([], variant_options, ezcad)
+        inactive_time = time.time() - start_time
+        shutil.rmtree(scratch_directory)
+        results.append((name, "process_inactive", inactive_time))
+        for part_name in names:
+            start_time = time.time()
+            stencil_frame, scratch_directory = frame_process([part_name], variant_options, ezcad)
+            results.append((name, "part/" + part_name,
+              max(0.0, time.time() - start_time - inactive_time)))
+            shutil.rmtree(scratch_directory)
+
+    # Write the results and report them next to the baseline:
+    benchmark_write(options.benchmark, results)
+    baseline = {}
+    if options.benchmark_baseline != None:
+        baseline = dict([((variant, phase), seconds)
+          for variant, phase, seconds in benchmark_read(options.benchmark_baseline)])
+    threshold = options.benchmark_threshold
+    regressions = 0
+    print("{0:<8} {1:<24} {2:>10} {3:>10}".format("Variant", "Phase", "Seconds", "Baseline"))
+    for variant, phase, seconds in results:
+        baseline_seconds = baseline.get((variant, phase))
+        regressed = baseline_seconds != None and seconds > baseline_seconds * (1.0 + threshold)
+        regressions += 1 if regressed else 0
+        print("{0:<8} {1:<24} {2:>10.3f} {3:>10} {4}".format(variant, phase, seconds,
+          "" if baseline_seconds == None else "{0:.3f}".format(baseline_seconds),
+          "REGRESSION" if regressed else ""))
+    if regressions > 0:
+        print("{0} phases are more than {1:.0f}% slower than the baseline".format(regressions,
+          threshold * 100.0))
+    return regressions == 0
+
+def frame_bom_collect(stencil_frame, name, copies, bom):
+    """ Add *copies* of the stock pieces, screws and holes of the solved *stencil_frame* to *bom*,
+        a (*pieces*, *screws*, *holes*) tuple.
+    """
+
+    # Check argument types:
+    assert isinstance(stencil_frame, StencilFrame)
+    assert isinstance(name, str)
+    assert isinstance(bom, tuple)
+
+    # Collect the stock piece and holes of each *Part*:
+    pieces, screws, holes = bom
+    prefix = "" if name == "" else name + "/"
+    for part in stencil_frame.parts_get():
+        if not isinstance(part, Stencil):
+            material_name, thickness, dx, dy = part.stock_get()
+            for copy in range(copies):
+                pieces.append(("{0}{1}#{2}".format(prefix, part.part_name, copy + 1),
+                  material_name, thickness, dx, dy))
+        for operation_name, arguments in part.operations:
+            if operation_name == "fasten":
+                location = stencil_frame.fastener_locate(arguments[1])
+                key = ("?" if location == None else location[0], arguments[2])
+                holes[key] = holes.get(key, 0) + copies
+
+    # Count the screws by kind and length:
+    for grid in stencil_frame.fastener_grids_get():
+        for suffix, fastener_name, fastener in grid.fasteners:
+            if fastener_name in grid.points:
+                start, end = grid.points[fastener_name]
+                length = math.sqrt(sum([(end_value.millimeters() - start_value.millimeters()) ** 2
+                  for start_value, end_value in ((start.x, end.x), (start.y, end.y),
+                  (start.z, end.z))])) / 25.4
+                key = (grid.kind, math.ceil(length * 8.0 - 1.0e-6) / 8.0)
+                screws[key] = screws.get(key, 0) + copies
+
+def frame_build(options, ezcad):
+    """ Build one stencil frame described by *options* into the current directory using *ezcad*
+        (*None* when nothing is rendered.)
+    """
+
+    # Check argument types:
+    assert ezcad == None or isinstance(ezcad, EZCAD3)
+
+    # Make sure that every *--part* names a real *Part*:
+    if options.part != None:
+        names = frame_names_get(options)
+        for name in options.part:
+            assert name in names, "Unknown --part '{0}' (the Parts are {1})".format(name,
+              " ".join(names))
+
+    # Without any EZCAD3 outputs, solve the dimensions offline so nothing is rendered:
+    outputs = options.outputs
+    stencil_frame = None
+    if not "cnc" in outputs and not "wrl" in outputs:
+        stencil_frame = frame_create(options)
+        frame_offline_solve(stencil_frame)
+        if options.trace_solve:
+            frame_solve_report(stencil_frame)
+        if options.schedule_report:
+            frame_schedule_report(stencil_frame)
+
+    # Regenerate only the stale (and requested) *Part*'s when requested:
+    elif options.incremental or options.store != None:
+        frame_incremental_build(options, ezcad)
+
+    # Generate only the requested *Part*'s:
+    elif options.part != None:
+        frame_generate(frame_names_get(options), options.part, options, ezcad)
+
+    # Farm the *Part*'s out to a pool of *jobs* workers when requested:
+    elif options.jobs > 1:
+        names = frame_names_get(options)
+        frame_generate(names, names, options, ezcad)
+
+    # Otherwise, create the *stencil_frame* assembly and process it:
+    else:
+        stencil_frame = frame_create(options)
+        stencil_frame.process(ezcad)
+        if options.trace_solve:
+            frame_solve_report(stencil_frame)
+        if options.schedule_report:
+            frame_schedule_report(stencil_frame)
+
+    # Print the requested reports, solving offline when the *Part*'s were built elsewhere:
+    if len([output for output in outputs if output in
+      ("bom", "clearance", "estimate", "gltf", "holes", "nest", "report")]) > 0:
+        if stencil_frame == None:
+            stencil_frame = frame_create(options)
+            frame_offline_solve(stencil_frame)
+        if "report" in outputs:
+            frame_dimensions_report(stencil_frame)
+        if "clearance" in outputs:
+            frame_clearance_report(stencil_frame)
+        if "estimate" in outputs:
+            frame_estimate_report(stencil_frame)
+        if "nest" in outputs:
+            frame_nest(stencil_frame, options)
+        if "bom" in outputs:
+            bom = ([], {}, {})
+            frame_bom_collect(stencil_frame, "", options.bom_copies, bom)
+            bom_report(bom, options)
+        if "gltf" in outputs:
+            shape_count, node_count = frame_gltf_write(stencil_frame,
+              "cnc" in outputs or "wrl" in outputs)
+            print("Wrote gltf/StencilFrame.gltf: {0} shapes for {1} instances".format(
+              shape_count, node_count))
+        if "holes" in outputs:
+            frame_holes_report(stencil_frame)
+
+def frame_clearance_check(stencil_frame):
+    """ Check the *Part*'s and fasteners of *stencil_frame* for interference and return the
+        (*boxes*, *overlaps*, *gaps*) found (see *frame_clearance_report*()).
+    """
+
+    # Check argument types:
+    assert isinstance(stencil_frame, StencilFrame)
+
+    # Collect the (*low*, *high*, (*kind*, *owner*, *name*)) boxes of the blocks and pockets
+    # of every *Part* along with the names of the fasteners that each *Part* is fastened to
+    # (a hole label can differ from its fastener name):
+    millimeters = lambda point: (point.x.millimeters(), point.y.millimeters(),
+      point.z.millimeters())
+    fastener_names = dict([(id(fastener), name) for grid in stencil_frame.fastener_grids_get()
+      for suffix, name, fastener in grid.fasteners])
+    boxes = []
+    contours = {}
+    fastened = {}
+    for part in stencil_frame.parts_get():
+        owner = part.part_name
+        contours[owner] = []
+        fastened[owner] = set()
+        for name, arguments in part.operations:
+            if name == "block":
+                corner1, corner2 = millimeters(arguments[3]), millimeters(arguments[4])
+                boxes.append((tuple([min(corner1[axis], corner2[axis]) for axis in range(3)]),
+                  tuple([max(corner1[axis], corner2[axis]) for axis in range(3)]),
+                  ("block", owner, arguments[0])))
+            elif name == "simple_pocket":
+                low, high, axis = part.operation_region_get(name, arguments)
+                boxes.append((low, high, ("pocket", owner, arguments[0])))
+            elif name == "fasten":
+                fastened[owner].add(fastener_names.get(id(arguments[1]), arguments[0]))
+            elif name == "contour":
+                z1, z2 = arguments[2].z.millimeters(), arguments[3].z.millimeters()
+                contours[owner].append((arguments[0], min(z1, z2), max(z1, z2)))
+
+    # Add the box around each configured fastener:
+    for grid in stencil_frame.fastener_grids_get():
+        radius = drill_diameters[drills[(grid.kind, "close")]] / 2.0 if grid.kind else 0.0
+        for suffix, name, fastener in grid.fasteners:
+            if name in grid.points:
+                point1, point2 = [millimeters(point) for point in grid.points[name]]
+                spans = [abs(point2[axis] - point1[axis]) for axis in range(3)]
+                hole_axis = spans.index(max(spans))
+                pad = [0.0 if axis == hole_axis else radius for axis in range(3)]
+                boxes.append(
+                  (tuple([min(point1[axis], point2[axis]) - pad[axis] for axis in range(3)]),
+                  tuple([max(point1[axis], point2[axis]) + pad[axis] for axis in range(3)]),
+                  ("fastener", grid.kind, name)))
+
+    # Return the pieces of a region that the pockets of *owners* leave behind:
+    box_tree = BoxTree(boxes)
+    epsilon = 1.0e-6
+    def unpocketed(low, high, owners):
+        pieces = [(low, high)]
+        for index in box_tree.query(low, high):
+            pocket_low, pocket_high, pocket_value = boxes[index]
+            if pocket_value[0] == "pocket" and pocket_value[1] in owners:
+                pieces = sum([box_subtract(piece_low, piece_high, pocket_low, pocket_high)
+                  for piece_low, piece_high in pieces], [])
+        return [(piece_low, piece_high) for piece_low, piece_high in pieces
+          if min([piece_high[axis] - piece_low[axis] for axis in range(3)]) > epsilon]
+
+    # Compare each block or fastener against the boxes within *clearance_minimum* of it:
+    overlaps = []
+    gaps = {}
+    for index1, box1 in enumerate(boxes):
+        low1, high1, value1 = box1
+        if value1[0] == "pocket":
+            continue
+        search_low  = tuple([low1[axis] - clearance_minimum for axis in range(3)])
+        search_high = tuple([high1[axis] + clearance_minimum for axis in range(3)])
+        for index2 in box_tree.query(search_low, search_high):
+            low2, high2, value2 = boxes[index2]
+            if value2[0] != "block" or value1[0] == "block" and index2 <= index1:
+                continue
+            if value1[0] == "block" and value1[1] == value2[1]:
+                continue
+            if value1[0] == "fastener" and value1[2] in fastened[value2[1]]:
+                continue
+
+            # Measure the overlap (positive on every axis) or the gap between the boxes:
+            overlap = [min(high1[axis], high2[axis]) - max(low1[axis], low2[axis])
+              for axis in range(3)]
+            owners = (value2[1],) if value1[0] == "fastener" else (value1[1], value2[1])
+            if min(overlap) > epsilon:
+                overlap_low  = tuple([max(low1[axis], low2[axis]) for axis in range(3)])
+                overlap_high = tuple([min(high1[axis], high2[axis]) for axis in range(3)])
+                pieces = unpocketed(overlap_low, overlap_high, owners)
+                if len(pieces) > 0:
+                    bottom = min([piece[0][2] for piece in pieces])
+                    top    = max([piece[1][2] for piece in pieces])
+                    contour_names = [name for owner in owners
+                      for name, z1, z2 in contours[owner] if z1 < top and bottom < z2]
+                    overlaps.append((value1, value2, pieces, contour_names))
+            elif min(overlap) < -epsilon:
+                gap = math.sqrt(sum([min(0.0, length) ** 2 for length in overlap]))
+                key = (value1[1] if value1[0] == "block" else value1[2], value2[1])
+                if gap < gaps.get(key, (clearance_minimum,))[0]:
+                    gaps[key] = (gap, value1, value2)
+
+    return boxes, overlaps, gaps
+
+def frame_clearance_report(stencil_frame):
+    """ Print every overlap and every gap below *clearance_minimum* between the *Part*'s and
+        fasteners of *stencil_frame* (see *frame_clearance_check*()).
+    """
+
+    # Check argument types:
+    assert isinstance(stencil_frame, StencilFrame)
+
+    # Print the results:
+    boxes, overlaps, gaps = frame_clearance_check(stencil_frame)
+    print("Clearance check of {0} boxes ({1} blocks, {2} pockets, {3} fasteners)".format(
+      len(boxes), len([box for box in boxes if box[2][0] == "block"]),
+      len([box for box in boxes if box[2][0] == "pocket"]),
+      len([box for box in boxes if box[2][0] == "fastener"])))
+    for value1, value2, pieces, contour_names in overlaps:
+        volume = sum([(high[0] - low[0]) * (high[1] - low[1]) * (high[2] - low[2])
+          for low, high in pieces])
+        low  = tuple([min([piece[0][axis] for piece in pieces]) for axis in range(3)])
+        high = tuple([max([piece[1][axis] for piece in pieces]) for axis in range(3)])
+        print("Overlap:   {0} {1} '{2}' and {3} '{4}': {5:.1f}mm^3 within "
+          "({6:.2f}, {7:.2f}, {8:.2f}) to ({9:.2f}, {10:.2f}, {11:.2f})".format(value1[0],
+          value1[1] if value1[0] == "block" else value1[2],
+          value1[2] if value1[0] == "block" else value1[1], value2[1], value2[2], volume,
+          *(low + high)))
+
+        # Point out the contours that may remove the overlap:
+        if len(contour_names) > 0:
+            print("           (unless cut away by {0})".format(" or ".join(contour_names)))
+    for key in sorted(gaps.keys()):
+        gap, value1, value2 = gaps[key]
+        print("Clearance: {0} {1} and {2} '{3}' are {4:.3f}mm apart".format(value1[0], key[0],
+          key[1], value2[2], gap))
+    print("{0} overlaps, {1} clearances under {2:.2f}mm".format(len(overlaps), len(gaps),
+      clearance_minimum))
+
+def frame_closure(stencil_frame, names):
+    """ Return the sorted names of the *Part*'s of *stencil_frame* (including "Stencil_Frame")
+        that must be constructed to generate the *Part*'s in *names*.
+    """
+
+    # Check argument types:
+    assert isinstance(stencil_frame, StencilFrame)
+    assert isinstance(names, list)
+
+    # Walk the inputs outward from *names*:
+    parts = dict([(part.part_name, part) for part in [stencil_frame] + stencil_frame.parts_get()])
+    closure = set()
+    pending = list(names)
+    while len(pending) > 0:
+        name = pending.pop()
+        if name in closure:
+            continue
+        closure.add(name)
+        part = parts[name]
+        inputs = part.inputs_get()
+        grids = part.grids_get() if name in names else []
+        if inputs == None or grids == None:
+            return sorted(parts.keys())
+        inputs = [input for input in inputs if not input is stencil_frame]
+        if len(grids) > 0:
+            closure.add(stencil_frame.part_name)
+        for grid in grids:
+            inputs += stencil_frame.grid_inputs_get(grid)
+        pending += [input.part_name for input in inputs]
+    return sorted(closure)
+
+def frame_create(options):
+    """ Create and return a new *StencilFrame* configured from the command line *options*.
+    """
+
+    # Create the *stencil_frame* and push the solver *options* down into every *Part*:
+    stencil_frame = StencilFrame(None, "Stencil_Frame", length_parse(options.stencil_dx),
+      length_parse(options.stencil_dy), length_parse(options.stencil_thickness),
+      length_parse(options.stencil_fold), debug=options.debug)
+    for part in [stencil_frame] + stencil_frame.parts_get():
+        part.air_clip_b        = options.air_clip
+        part.length_exact_b    = options.lengths == "exact"
+        part.operation_order_b = options.schedule
+        part.profile_b         = options.profile != None
+        part.schedule_report_b = options.schedule_report
+        part.solve_fast_b      = options.fast_solve
+        part.solve_trace_b     = options.trace_solve
+
+    # Override the design parameters given with *--set*:
+    parts = dict([(part.part_name, part)
+      for part in [stencil_frame] + stencil_frame.parts_get()])
+    for text in options.set or []:
+        part_name, attribute, values = parameter_parse(text)
+        assert part_name in parts, "--set: There is no Part named '{0}'".format(part_name)
+        part = parts[part_name]
+        assert isinstance(getattr(part, attribute + "_l", None), L), (
+          "--set: {0} has no '{1}' length".format(part_name, attribute))
+        assert len(values) == 1, "--set: '{0}' must have exactly one value".format(text)
+        setattr(part, attribute + "_l", values[0])
+    return stencil_frame
+
+def frame_dimensions_report(stencil_frame):
+    """ Print the bounding box and size (in millimeters) of each *Part* in *stencil_frame*.
+    """
+
+    # Check argument types:
+    assert isinstance(stencil_frame, StencilFrame)
+
+    # Print one line per *Part*:
+    print("{0:<16} {1:>26} {2:>26} {3:>8} {4:>8} {5:>8}".format("Part", "BSW", "TNE",
+      "DX", "DY", "DZ"))
+    millimeters = lambda point: "({0:.2f}, {1:.2f}, {2:.2f})".format(point.x.millimeters(),
+      point.y.millimeters(), point.z.millimeters())
+    for part in [stencil_frame] + stencil_frame.parts_get():
+        print("{0:<16} {1:>26} {2:>26} {3:>8.2f} {4:>8.2f} {5:>8.2f}".format(part.part_name,
+          millimeters(part.bsw), millimeters(part.tne), part.dx.millimeters(),
+          part.dy.millimeters(), part.dz.millimeters()))
+
+def frame_estimate_report(stencil_frame):
+    """ Print the estimated cutting time, rapid time, tool changes and removed volume of each
+        setup of each *Part* in *stencil_frame* (see *BasePart.estimate_get*()).
+    """
+
+    # Check argument types:
+    assert isinstance(stencil_frame, StencilFrame)
+
+    # Print each setup of each *Part* followed by the *Part* total:
+    line_format = "{0:<16} {1:<16} {2:>8.1f} {3:>8.1f} {4:>7} {5:>9.2f}"
+    print("{0:<16} {1:<16} {2:>8} {3:>8} {4:>7} {5:>9}".format("Part", "Setup",
+      "Cut s", "Rapid s", "Changes", "Cut cm^3"))
+    totals = [0.0, 0.0, 0, 0.0]
+    for part in stencil_frame.parts_get():
+        part_totals = [0.0, 0.0, 0, 0.0]
+        for setup in part.estimate_get():
+            setup_name, cut_time, rapid_time, changes, volume = setup
+            print(line_format.format(part.part_name, setup_name, cut_time, rapid_time, changes,
+              volume / 1000.0))
+            for index, value in enumerate(setup[1:]):
+                part_totals[index] += value
+                totals[index] += value
+        seconds = part_totals[0] + part_totals[1] + part_totals[2] * tool_change_time
+        print(line_format.format(part.part_name, "Total {0:.1f}s".format(seconds),
+          part_totals[0], part_totals[1], part_totals[2], part_totals[3] / 1000.0))
+    seconds = totals[0] + totals[1] + totals[2] * tool_change_time
+    print(line_format.format("All Parts", "Total {0:.1f}s".format(seconds),
+      totals[0], totals[1], totals[2], totals[3] / 1000.0))
+
+def frame_generate(names, generate_names, options, ezcad):
+    """ Generate the artifacts of the *Part*'s in *generate_names* with *ezcad* in up to
+        *options.jobs* workers and return a dictionary from each name to its list of artifacts.
+    """
+
+    # Check argument types:
+    assert isinstance(names, list)
+    assert isinstance(generate_names, list)
+    assert isinstance(ezcad, EZCAD3)
+
+    import multiprocessing
+    import shutil
+
+    # Split *generate_names* into groups:
+    groups_count = min(options.jobs, len(generate_names))
+    groups = [generate_names[index::groups_count] for index in range(groups_count)]
+
+    # Run each group either in this process or in a worker process and merge the results in
+    # job order as soon as each one is done:
+    all_names = names + ["Stencil_Frame"]
+    merge_assembly = len(generate_names) == len(names) and "wrl" in options.outputs
+    artifacts = {}
+    errors = []
+    pool = None
+    if groups_count == 1:
+        stencil_frame, scratch_directory = frame_process(generate_names, options, ezcad)
+        results = [(scratch_directory, "", {})]
+    else:
+        pool = multiprocessing.Pool(groups_count, frame_job_start, (ezcad,))
+        results = pool.imap(frame_job, [(group, options) for group in groups], 1)
+    try:
+        for group_index, result in enumerate(results):
+            group = groups[group_index]
+            scratch_directory, log, profiles = result
+            profile_merge(profiles)
+            if groups_count > 1:
+                print("==== {0} ====".format(" ".join(group)))
+                sys.stdout.write(log)
+                sys.stdout.flush()
+            if scratch_directory == None:
+                errors.append(" ".join(group))
+            else:
+                artifacts.update(artifacts_merge(scratch_directory, os.getcwd(), all_names,
+                  group + (["Stencil_Frame"] if merge_assembly and group_index == 0 else [])))
+                shutil.rmtree(scratch_directory)
+    finally:
+        if pool != None:
+            pool.close()
+            pool.join()
+    assert len(errors) == 0, "Generation failed for: {0}".format(", ".join(errors))
+    return artifacts
+
+def frame_gltf_write(stencil_frame, wrl_read):
+    """ Write the *stencil_frame* assembly as a glTF scene into the "gltf" directory, reading
+        the EZCAD3 wrl meshes when *wrl_read*, and return the number of shapes and nodes.
+    """
+
+    # Check argument types:
+    assert isinstance(stencil_frame, StencilFrame)
+    assert isinstance(wrl_read, bool)
+
+    import json
+
+    # Find the shape that the (*vertices*, *triangles*) *mesh* is an instance of with a
+    # *mirror* scale, storing it centered when it is new, and add a node *name* for it.  A
+    # new shape is named *shape_name* and one placed by a node *matrix* is stored as it is:
+    shapes = []
+    shape_indices = {}
+    meshes = []
+    mesh_indices = {}
+    nodes = []
+    def instance_add(name, shape_name, mesh, color_name, matrix=None):
+        vertices, triangles = mesh
+        center = [(min([vertex[axis] for vertex in vertices]) +
+          max([vertex[axis] for vertex in vertices])) / 2.0 for axis in range(3)]
+        mirrors = ((1, 1, 1), (-1, 1, 1), (1, -1, 1), (1, 1, -1))
+        if matrix != None:
+            center = [0.0, 0.0, 0.0]
+            mirrors = mirrors[:1]
+        centered = [tuple([vertex[axis] - center[axis] for axis in range(3)])
+          for vertex in vertices]
+        for mirror in mirrors:
+            key = mesh_key_get([tuple([vertex[axis] * mirror[axis] for axis in range(3)])
+              for vertex in centered], triangles)
+            if key in shape_indices:
+                break
+        else:
+            mirror = (1, 1, 1)
+            key = mesh_key_get(centered, triangles)
+            shape_indices[key] = len(shapes)
+            shapes.append((centered, triangles))
+        mesh_key = (shape_indices[key], color_name)
+        if not mesh_key in mesh_indices:
+            mesh_indices[mesh_key] = len(meshes)
+            meshes.append((shape_name, shape_indices[key], color_name))
+        node = {"name": name, "mesh": mesh_indices[mesh_key]}
+        if matrix != None:
+            node["matrix"] = matrix
+        else:
+            node["translation"] = center
+        if mirror != (1, 1, 1):
+            node["scale"] = list(mirror)
+        nodes.append(node)
+
+    # Add each *Part* in the color of its first *block*:
+    color_names = dict([(id(color), name) for name, color in colors.items()])
+    for part in stencil_frame.parts_get():
+        blocks = [arguments for name, arguments in part.operations if name == "block"]
+        mesh = None
+        if wrl_read:
+            mesh = wrl_mesh_read(os.path.join("wrl", part.part_name.replace("_", "") + ".wrl"))
+        if mesh == None:
+            mesh = box_mesh_get([tuple([(corner.x.millimeters(), corner.y.millimeters(),
+              corner.z.millimeters()) for corner in arguments[3:5]]) for arguments in blocks])
+        if len(mesh[1]) > 0:
+            color_name = color_names.get(id(blocks[0][2]), "") if len(blocks) > 0 else ""
+            instance_add(part.part_name, part.part_name, mesh, color_name)
+
+    # Add each fastener as a cylinder the size of its close fit drill, turned from the Z axis
+    # onto the axis of its screw by a node matrix (*u*, *v*, *w* and the translation):
+    for grid in stencil_frame.fastener_grids_get():
+        for suffix, name, fastener in grid.fasteners:
+            if not name in grid.points:
+                continue
+            start, end = [(point.x.millimeters(), point.y.millimeters(), point.z.millimeters())
+              for point in grid.points[name]]
+            w = [end[axis] - start[axis] for axis in range(3)]
+            length = math.sqrt(sum([value * value for value in w]))
+            if length == 0.0:
+                continue
+            w = [value / length for value in w]
+            a = (1.0, 0.0, 0.0) if abs(w[0]) < 0.9 else (0.0, 1.0, 0.0)
+            dot = sum([a[axis] * w[axis] for axis in range(3)])
+            u = [a[axis] - dot * w[axis] for axis in range(3)]
+            u = [value / math.sqrt(sum([value * value for value in u])) for value in u]
+            v = [w[1] * u[2] - w[2] * u[1], w[2] * u[0] - w[0] * u[2], w[0] * u[1] - w[1] * u[0]]
+            instance_add(name, "{0}_{1:.3f}in".format(grid.kind, length / 25.4),
+              cylinder_mesh_get(drill_diameters[drills[(grid.kind, "close")]], round(length, 3)),
+              "", u + [0.0] + v + [0.0] + w + [0.0] + list(start) + [1.0])
+
+    # Pack every shape into the buffer, positions first and then triangle indices (both are
+    # 4 bytes per value, so everything stays aligned):
+    positions = array.array("f")
+    indices = array.array("I")
+    assert positions.itemsize == 4 and indices.itemsize == 4
+    accessors = []
+    for vertices, triangles in shapes:
+        first_position = len(positions)
+        for vertex in vertices:
+            positions.extend(vertex)
+        stored = positions[first_position:]
+        accessors.append({"bufferView": 0, "byteOffset": first_position * 4,
+          "componentType": 5126, "count": len(vertices), "type": "VEC3",
+          "min": [min(stored[axis::3]) for axis in range(3)],
+          "max": [max(stored[axis::3]) for axis in range(3)]})
+        accessors.append({"bufferView": 1, "byteOffset": len(indices) * 4,
+          "componentType": 5125, "count": 3 * len(triangles), "type": "SCALAR"})
+        for triangle in triangles:
+            indices.extend(triangle)
+    if sys.byteorder == "big":
+        positions.byteswap()
+        indices.byteswap()
+
+    # Give each (shape, color) mesh the material of its color (fasteners are metal):
+    gltf_meshes = []
+    gltf_materials = []
+    material_indices = {}
+    for name, shape_index, color_name in meshes:
+        if not color_name in material_indices:
+            material_indices[color_name] = len(gltf_materials)
+            gltf_materials.append({"name": color_name or "fastener", "pbrMetallicRoughness": {
+              "baseColorFactor": list(color_rgbs.get(color_name, (0.75, 0.75, 0.75))) + [1.0],
+              "metallicFactor": 0.0 if color_name else 1.0, "roughnessFactor": 0.6}})
+        gltf_meshes.append({"name": name, "primitives": [{"attributes":
+          {"POSITION": 2 * shape_index}, "indices": 2 * shape_index + 1,
+          "material": material_indices[color_name]}]})
+
+    # Write the buffer and the scene, with the root node scaling millimeters to meters:
+    if not os.path.isdir("gltf"):
+        os.makedirs("gltf")
+    with AtomicFile(os.path.join("gltf", "StencilFrame.bin"), "wb") as buffer_file:
+        positions.tofile(buffer_file)
+        indices.tofile(buffer_file)
+    scene = {"asset": {"version": "2.0", "generator": "stencil_frame.py"},
+      "scene": 0, "scenes": [{"nodes": [0]}],
+      "nodes": [{"name": stencil_frame.part_name, "scale": [0.001, 0.001, 0.001],
+      "children": range(1, len(nodes) + 1)}] + nodes,
+      "meshes": gltf_meshes, "materials": gltf_materials, "accessors": accessors,
+      "bufferViews": [
+      {"buffer": 0, "byteOffset": 0, "byteLength": len(positions) * 4, "target": 34962},
+      {"buffer": 0, "byteOffset": len(positions) * 4, "byteLength": len(indices) * 4,
+      "target": 34963}],
+      "buffers": [{"uri": "StencilFrame.bin", "byteLength": (len(positions) + len(indices)) * 4}]}
+    with AtomicFile(os.path.join("gltf", "StencilFrame.gltf")) as scene_file:
+        json.dump(scene, scene_file, sort_keys=True, separators=(",", ":"))
+        scene_file.write("\n")
+    return len(shapes), len(nodes)
+
+def frame_holes_report(stencil_frame):
+    """ Print each distinct *HoleFeature* of *stencil_frame* and the number of holes of each
+        *Part*.
+    """
+
+    # Check argument types:
+    assert isinstance(stencil_frame, StencilFrame)
+
+    # Count the holes of every *Part* and of every feature:
+    features = {}
+    feature_counts = {}
+    part_counts = []
+    for part in stencil_frame.parts_get():
+        holes = part.holes_get()
+        for setup_name, feature, entry, axis in holes:
+            features[feature.name] = feature
+            feature_counts[feature.name] = feature_counts.get(feature.name, 0) + 1
+        if len(holes) > 0:
+            part_counts.append((part.part_name, len(holes)))
+
+    # Print one line per feature and then one per *Part*:
+    print("{0:<32} {1:<20} {2:>8} {3:>6}".format("Hole Feature", "Drill", "Seconds", "Holes"))
+    for name in sorted(features.keys()):
+        feature = features[name]
+        print("{0:<32} {1:<20} {2:>8.1f} {3:>6}".format(name, feature.drill, feature.cut_time,
+          feature_counts[name]))
+    for part_name, count in part_counts:
+        print("{0:<16} {1:>3} holes".format(part_name, count))
+    print("{0} holes share {1} hole features".format(sum(feature_counts.values()),
+      len(features)))
+
+def frame_incremental_build(options, ezcad):
+    """ Build the stencil frame with *ezcad*, regenerating only the *Part*'s whose artifacts
+        are neither fresh in the *BuildCache* nor in the *ArtifactStore*.
+    """
+
+    # Check argument types:
+    assert isinstance(ezcad, EZCAD3)
+
+    import shutil
+
+    # Solve the dimensions offline to get the current fingerprints:
+    stencil_frame = frame_create(options)
+    frame_offline_solve(stencil_frame)
+    parts = stencil_frame.parts_get()
+    names = [part.part_name for part in parts]
+    fingerprints = dict([(part.part_name, part.fingerprint_get()) for part in parts])
+    fingerprints["Stencil_Frame"] = stencil_frame.assembly_fingerprint_get()
+
+    # Figure out which *Part*'s need to be regenerated (only the *--part* ones, if any, and
+    # the assembly when its view is wanted):
+    build_cache = None
+    stale_names = [name for name in names if options.part == None or name in options.part]
+    if "wrl" in options.outputs:
+        stale_names.append("Stencil_Frame")
+    if options.incremental:
+        build_cache = BuildCache(options.cache)
+        stale_names = [name for name in stale_names
+          if not build_cache.is_fresh(name, fingerprints[name])]
+
+    # Copy the stale *Part*'s that are already in the *artifact_store*:
+    artifacts = {}
+    artifact_store = None
+    if options.store != None:
+        artifact_store = ArtifactStore(options.store)
+        for name in stale_names:
+            stored_artifacts = artifact_store.fetch(fingerprints[name], os.getcwd())
+            if stored_artifacts != None:
+                artifacts[name] = stored_artifacts
+    stored_names = artifacts.keys()
+    generate_names = [name for name in stale_names
+      if not name in artifacts and name != "Stencil_Frame"]
+
+    # Regenerate the rest.  Unless that brought the assembly along, render it from a pass
+    # with every *Part* inactive:
+    if len(generate_names) > 0:
+        artifacts.update(frame_generate(names, generate_names, options, ezcad))
+    if "Stencil_Frame" in stale_names and not "Stencil_Frame" in artifacts:
+        solve_frame, scratch_directory = frame_process([], options, ezcad)
+        artifacts.update(artifacts_merge(scratch_directory, os.getcwd(),
+          names + ["Stencil_Frame"], ["Stencil_Frame"]))
+        shutil.rmtree(scratch_directory)
+
+    # Add the new artifacts to the *artifact_store* and record those of every stale *Part*:
+    if artifact_store != None:
+        for name in stale_names:
+            if not name in stored_names:
+                artifact_store.put(fingerprints[name], os.getcwd(), artifacts[name])
+    if build_cache != None and len(stale_names) > 0:
+        for name in stale_names:
+            build_cache.record(name, fingerprints[name], artifacts[name])
+        build_cache.save()
+    print("{0} of {1} Parts regenerated: {2}".format(
+      len(generate_names), len(names), " ".join(generate_names)))
+    if artifact_store != None:
+        print("{0} of {1} Parts copied from the store: {2}".format(
+          len([name for name in stored_names if name != "Stencil_Frame"]), len(names),
+          " ".join([name for name in stale_names if name in stored_names and
+          name != "Stencil_Frame"])))
+    print("Assembly {0}".format("skipped (no wrl output)" if not "wrl" in options.outputs else
+      "up to date" if not "Stencil_Frame" in stale_names else
+      "copied from the store" if "Stencil_Frame" in stored_names else "regenerated"))
+
+def frame_job(job):
+    """ Run one *frame_generate*() *job* in a worker process and return its scratch directory,
+        captured log and *operation_profiles*.
+    """
+
+    import tempfile
+    import traceback
+
+    # Redirect the standard output and error file descriptors into *log_file*:
+    active_names, options = job
+    log_file = tempfile.TemporaryFile()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved_descriptors = (os.dup(1), os.dup(2))
+    os.dup2(log_file.fileno(), 1)
+    os.dup2(log_file.fileno(), 2)
+
+    # Process the frame with only *active_names* active, profiling just this job (the
+    # worker may have run other jobs and forked with the profiles of its parent):
+    operation_profiles.clear()
+    try:
+        stencil_frame, scratch_directory = frame_process(active_names, options, job_ezcads[0])
+    except Exception:
+        scratch_directory = None
+        traceback.print_exc()
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(saved_descriptors[0], 1)
+        os.dup2(saved_descriptors[1], 2)
+        os.close(saved_descriptors[0])
+        os.close(saved_descriptors[1])
+
+    # Return the results:
+    log_file.seek(0)
+    log = log_file.read()
+    log_file.close()
+    return scratch_directory, log, dict(operation_profiles)
+
+def frame_job_start(ezcad):
+    """ Start a *frame_generate*() worker process off with *ezcad* for its *frame_job*()'s.
+        The worker forks with a copy of *ezcad* rather than receiving a pickled one.
+    """
+
+    # Check argument types:
+    assert isinstance(ezcad, EZCAD3)
+
+    # Remember *ezcad*:
+    job_ezcads[:] = [ezcad]
+
+def frame_names_get(options):
+    """ Return the names of the *Part*'s of a stencil frame built from *options* in
+        construction order.
+    """
+
+    return [part.part_name for part in frame_create(options).parts_get()]
+
+def frame_nest(stencil_frame, options):
+    """ Nest the tooling plate stock of the *Part*'s of *stencil_frame* onto plate loads and
+        write a plan and a LinuxCNC wrapper program for each load into the "nest" directory.
+    """
+
+    # Check argument types:
+    assert isinstance(stencil_frame, StencilFrame)
+
+    # Collect the stock footprint of every *Part* that goes onto the tooling plate:
+    items = []
+    for copy in range(options.nest_copies):
+        for part in stencil_frame.parts_get():
+            footprint = part.plate_footprint_get()
+            if footprint != None:
+                setup_name, dx, dy = footprint
+                items.append(((part.part_name, setup_name, copy + 1), dx, dy))
+
+    # Pack the footprints and write one plan and program per plate load.  The units and modes
+    # are restored after each call since the called program may have changed them:
+    sizes = dict([(key, (dx, dy)) for key, dx, dy in items])
+    plate_dx = length_parse(options.plate_dx).millimeters()
+    plate_dy = length_parse(options.plate_dy).millimeters()
+    plates = nest_pack(items, plate_dx, plate_dy, length_parse(plate_spacing).millimeters(),
+      length_parse(plate_pitch).millimeters())
+    if not os.path.isdir("nest"):
+        os.makedirs("nest")
+    for plate_index, placements in enumerate(plates):
+        base_name = os.path.join("nest", "plate_{0}".format(plate_index + 1))
+        with AtomicFile(base_name + ".ngc") as program_file:
+            with AtomicFile(base_name + ".txt") as plan_file:
+                program_file.write("( Plate load {0} of {1}: {2:.1f}mm x {3:.1f}mm )\n"
+                  "G21 G90 G17\n".format(plate_index + 1, len(plates), plate_dx, plate_dy))
+                for offset_index, placement in enumerate(placements):
+                    key, x, y, rotated = placement
+                    part_name, setup_name, copy = key
+                    plan_file.write("{0} copy {1} ({2}) at X{3:.3f} Y{4:.3f} {5}\n".format(
+                      part_name, copy, setup_name, x, y,
+                      "turned 90 degrees" if rotated else "not turned"))
+
+                    # Turning the stock 90 degrees about its south west corner swings it into
+                    # -X, so the work offset origin moves over by the turned width (i.e. the
+                    # stock *dy*):
+                    origin_x = x + (sizes[key][1] if rotated else 0.0)
+                    program_file.write("( {0} copy {1} )\n".format(part_name, copy))
+                    program_file.write("G10 L2 P{0} X[#5221+{1:.3f}] Y[#5222+{2:.3f}] R{3}\n"
+                      .format(offset_index + 2, origin_x, y, 90 if rotated else 0))
+                    program_file.write("G{0}\n".format(("55", "56", "57", "58", "59", "59.1",
+                      "59.2", "59.3")[offset_index]))
+                    program_file.write("o<{0}_{1}> call\nG21 G90 G17\n".format(
+                      part_name.lower(), setup_name.lower()))
+                program_file.write("G54\nM2\n")
+        print("Plate load {0}: {1}".format(plate_index + 1, ", ".join(
+          ["{0}#{1}".format(placement[0][0], placement[0][2]) for placement in placements])))
+    print("{0} Parts nested onto {1} plate loads".format(len(items), len(plates)))
+
+    # Wrap each tooling plate program as the subroutine file that the plate programs call.
+    # The program ends and work offset selections are dropped so that the work offset of the
+    # plate program stays in force and the plate program carries on after the call:
+    for part_name, setup_name in sorted(set([key[:2] for key, dx, dy in items])):
+        subroutine_name = "{0}_{1}".format(part_name, setup_name).lower()
+        program_path = setup_program_find(part_name, setup_name)
+        if program_path == None:
+            print("No {0} {1} program was found, so 'nest/{2}.ngc' was not written "
+              "(add cnc to the outputs)".format(part_name, setup_name, subroutine_name))
+            continue
+        with open(program_path) as program_file:
+            with AtomicFile(os.path.join("nest", subroutine_name + ".ngc")) as subroutine_file:
+                subroutine_file.write("( {0} {1} from {2} )\no<{3}> sub\n".format(part_name,
+                  setup_name, program_path, subroutine_name))
+                ends = 0
+                for line in program_file:
+                    line, count = program_line_strip(line)
+                    ends += count
+                    if line != "" and line != "%" and not re.match(r"^N\d+$", line):
+                        subroutine_file.write(line + "\n")
+                assert ends > 0, "No M2 or M30 program end was found in '{0}'".format(
+                  program_path)
+                subroutine_file.write("o<{0}> endsub\nM2\n".format(subroutine_name))
+
+def frame_offline_solve(stencil_frame):
+    """ Solve the dimensions of *stencil_frame* without EZCAD3 and return the number of
+        *construct*() passes.
+    """
+
+    # Check argument types:
+    assert isinstance(stencil_frame, StencilFrame)
+
+    # Start every *Part* off offline with an empty bounding box and, for exact lengths,
+    # with exact design parameters:
+    parts = [stencil_frame] + stencil_frame.parts_get()
+    origin = (0, 0, 0)
+    for part in parts:
+        part.offline_b = True
+        part.box_set(origin, origin)
+        if part.length_exact_b:
+            for name, value in vars(part).items():
+                if name.endswith("_l") and isinstance(value, L):
+                    setattr(part, name, ExactL(length_exact(value)))
+
+    # Run *construct*() passes until the snapshots stop changing.  The assembly bounding
+    # box encloses its *Part*'s:
+    passes_limit = 20
+    for passes in range(1, passes_limit + 1):
+        snapshots = [part.snapshot_get() for part in parts]
+        for part in parts:
+            part.offline_box = None
+            part.construct()
+            if part.offline_box != None:
+                part.box_set(*part.offline_box)
+        boxes = [part.offline_box for part in parts[1:] if part.offline_box != None]
+        if len(boxes) > 0:
+            stencil_frame.box_set(
+              tuple([min([box[0][axis] for box in boxes]) for axis in range(3)]),
+              tuple([max([box[1][axis] for box in boxes]) for axis in range(3)]))
+        if snapshots == [part.snapshot_get() for part in parts]:
+            return passes
+    assert False, "The offline solve did not settle in {0} passes".format(passes_limit)
+
+def frame_process(active_names, options, ezcad):
+    """ Process a new *StencilFrame* with *ezcad* in a scratch directory with only the *Part*'s
+        in *active_names* active and return both.
+    """
+
+    # Check argument types:
+    assert isinstance(active_names, list)
+    assert isinstance(ezcad, EZCAD3)
+
+    import tempfile
+
+    # Create the *stencil_frame* and deactivate everything not in *active_names*:
+    stencil_frame = frame_create(options)
+    for part in stencil_frame.parts_get():
+        part.active_b = part.part_name in active_names
+
+    # With *--part*, do not even construct the *Part*'s that *active_names* do not read:
+    if options.part != None and len(active_names) > 0:
+        needed_names = frame_closure(stencil_frame, active_names)
+        for part in [stencil_frame] + stencil_frame.parts_get():
+            part.needed_b = part.part_name in needed_names
+        print("Constructing {0} of {1} Parts for {2}: {3}".format(len(needed_names),
+          len(stencil_frame.parts_get()) + 1, " ".join(active_names), " ".join(needed_names)))
+
+    # Process *stencil_frame* from inside of a scratch directory:
+    scratch_directory = tempfile.mkdtemp(prefix="stencil_frame_")
+    current_directory = os.getcwd()
+    os.chdir(scratch_directory)
+    try:
+        stencil_frame.process(ezcad)
+    finally:
+        os.chdir(current_directory)
+    if options.trace_solve:
+        frame_solve_report(stencil_frame)
+    if options.schedule_report:
+        frame_schedule_report(stencil_frame)
+    return stencil_frame, scratch_directory
+
+def frame_schedule_report(stencil_frame):
+    """ Print the tool changes and the tool change and rapid time of every *Part* in
+        *stencil_frame* in source and scheduled order.
+    """
+
+    # Check argument types:
+    assert isinstance(stencil_frame, StencilFrame)
+
+    # Print one line per *Part* followed by the totals:
+    print("{0:<16} {1:>14} {2:>14} {3:>10} {4:>10} {5:>10}".format("Part",
+      "Source changes", "Sched. changes", "Source s", "Sched. s", "Air cm^3"))
+    totals = [0, 0, 0.0, 0.0, 0.0]
+    for part in [stencil_frame] + stencil_frame.parts_get():
+        source_changes, schedule_changes, source_travel, schedule_travel = part.schedule_record
+        source_seconds   = source_changes * tool_change_time + source_travel / rapid_speed
+        schedule_seconds = schedule_changes * tool_change_time + schedule_travel / rapid_speed
+        air_volume = part.air_volume / 1000.0
+        print("{0:<16} {1:>14} {2:>14} {3:>10.1f} {4:>10.1f} {5:>10.2f}".format(part.part_name,
+          source_changes, schedule_changes, source_seconds, schedule_seconds, air_volume))
+        for index, value in enumerate((source_changes, schedule_changes,
+          source_seconds, schedule_seconds, air_volume)):
+            totals[index] += value
+    print("{0:<16} {1:>14} {2:>14} {3:>10.1f} {4:>10.1f} {5:>10.2f}".format("Total", *totals))
+
+def frame_solve_report(stencil_frame):
+    """ Print the *construct*() pass records of every *Part* in *stencil_frame*: the time of
+        each pass, whether it was replayed and which values were still changing.
+    """
+
+    # Check argument types:
+    assert isinstance(stencil_frame, StencilFrame)
+
+    # Print the passes of each *Part*:
+    parts = [stencil_frame] + stencil_frame.parts_get()
+    print("{0:<16} {1:>6} {2:>7} {3:>10}".format("Part", "Passes", "Replays", "Total ms"))
+    for part in parts:
+        records = part.pass_records
+        print("{0:<16} {1:>6} {2:>7} {3:>10.3f}".format(part.part_name, len(records),
+          len([record for record in records if record[1]]),
+          sum([record[0] for record in records]) * 1000.0))
+        for index, record in enumerate(records):
+            seconds, replayed, changed_names = record
+            print("    pass {0:<3} {1:>8.3f}ms {2:<8} changed: {3}".format(index + 1,
+              seconds * 1000.0, "replayed" if replayed else "", " ".join(changed_names)))
+
+    # Print the totals for each pass across all *Part*'s:
+    passes_count = max([len(part.pass_records) for part in parts])
+    for index in range(passes_count):
+        records = [part.pass_records[index] for part in parts if index < len(part.pass_records)]
+        print("Pass {0:<3} {1:>8.3f}ms {2} Parts changed".format(index + 1,
+          sum([record[0] for record in records]) * 1000.0,
+          len([record for record in records if len(record[2]) > 0])))
+
+def frame_sweep(options, ezcad):
+    """ Evaluate every combination of the design parameters in *options.sweep*, rank them and
+        build the best *options.sweep_build* of them with *ezcad*.
+    """
+
+    # Check argument types:
+    assert ezcad == None or isinstance(ezcad, EZCAD3)
+
+    # Expand the sweeps into the grid of "--set" lists:
+    sweeps = [parameter_parse(text) for text in options.sweep]
+    grid = [[]]
+    for part_name, attribute, values in sweeps:
+        grid = [settings + ["{0}.{1}={2:.6g}mm".format(part_name, attribute, value.millimeters())]
+          for settings in grid for value in values]
+    jobs = [((options.set or []) + settings, options) for settings in grid]
+
+    # Evaluate the combinations, either here or in a pool of worker processes:
+    start_time = time.time()
+    if options.jobs == 1 or len(jobs) == 1:
+        results = [frame_sweep_job(job) for job in jobs]
+    else:
+        import multiprocessing
+
+        pool = multiprocessing.Pool(min(options.jobs, len(jobs)))
+        try:
+            results = pool.map(frame_sweep_job, jobs, 1)
+        finally:
+            pool.close()
+            pool.join()
+
+    # Print the surviving combinations from best to worst, then the pruned ones:
+    survivors = sorted([result for result in results if result[1] == None],
+      key=lambda result: (result[2], result[3]))
+    pruned = [result for result in results if result[1] != None]
+    print("{0} of {1} combinations survived in {2:.2f}s".format(len(survivors), len(results),
+      time.time() - start_time))
+    print("{0:>4} {1:>10} {2:>9}  {3}".format("Rank", "Stock cm^3", "Machine s", "Settings"))
+    for rank, result in enumerate(survivors):
+        settings, reason, volume, seconds = result
+        print("{0:>4} {1:>10.1f} {2:>9.1f}  {3}".format(rank + 1, volume / 1000.0, seconds,
+          " ".join(settings[-len(sweeps):])))
+    for settings, reason, volume, seconds in pruned:
+        print("Pruned: {0} ({1})".format(" ".join(settings[-len(sweeps):]), reason))
+
+    # Build the best combinations:
+    current_directory = os.getcwd()
+    for rank, result in enumerate(survivors[:options.sweep_build]):
+        variant_options = argparse.Namespace(**vars(options))
+        variant_options.set = result[0]
+        directory = os.path.join(current_directory, "sweep", str(rank + 1))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        os.chdir(directory)
+        try:
+            frame_build(variant_options, ezcad)
+        finally:
+            os.chdir(current_directory)
+
+def frame_sweep_job(job):
+    """ Evaluate one *frame_sweep*() *job* and return its (*settings*, *reason*, *stock_volume*,
+        *machine_time*) tuple.
+    """
+
+    # Solve the combination offline:
+    settings, options = job
+    variant_options = argparse.Namespace(**vars(options))
+    variant_options.set = settings
+    try:
+        stencil_frame = frame_create(variant_options)
+        frame_offline_solve(stencil_frame)
+    except Exception as error:
+        return settings, "does not solve: {0}".format(error), None, None
+
+    # Prune the combinations with overlaps that no contour explains:
+    boxes, overlaps, gaps = frame_clearance_check(stencil_frame)
+    overlaps = [overlap for overlap in overlaps if len(overlap[3]) == 0]
+    if len(overlaps) > 0:
+        return settings, "{0} overlaps, e.g. {1} and {2}".format(len(overlaps),
+          overlaps[0][0][2] if overlaps[0][0][0] == "fastener" else overlaps[0][0][1],
+          overlaps[0][1][1]), None, None
+
+    # Add up the stock and the estimated machine time:
+    volume = 0.0
+    seconds = 0.0
+    for part in stencil_frame.parts_get():
+        low, high = part.offline_box
+        volume += (high[0] - low[0]) * (high[1] - low[1]) * (high[2] - low[2])
+        for setup_name, cut_time, rapid_time, changes, removed in part.estimate_get():
+            seconds += cut_time + rapid_time + changes * tool_change_time
+    return settings, None, volume, seconds
+
+def frame_watch(options, ezcad):
+    """ Build the stencil frame described by *options* with *ezcad* and rebuild it every time
+        this file is saved, until interrupted.
+    """
+
+    # Check argument types:
+    assert ezcad == None or isinstance(ezcad, EZCAD3)
+
+    import subprocess
+    import traceback
+
+    # Watch the source file rather than any compiled version of it:
+    path = os.path.splitext(os.path.abspath(__file__))[0] + ".py"
+    watch_options = argparse.Namespace(**vars(options))
+    watch_options.incremental = True
+    view_path = os.path.join("wrl", "StencilFrame.wrl")
+    if "gltf" in options.outputs:
+        view_path = os.path.join("gltf", "StencilFrame.gltf")
+    elif options.viewer != None and not "wrl" in options.outputs:
+        watch_options.outputs = options.outputs + ["wrl"]
+    module = sys.modules[__name__]
+    modification_time = None
+    viewer = None
+    try:
+        while True:
+            # Wait for *path* to change (it can briefly go missing while an editor saves it):
+            try:
+                new_modification_time = os.path.getmtime(path)
+            except OSError:
+                new_modification_time = modification_time
+            if new_modification_time == modification_time:
+                time.sleep(options.watch_interval)
+                continue
+
+            # Rebuild with a freshly loaded copy of this file (except the first time):
+            start_time = time.time()
+            status = "Failed"
+            try:
+                if modification_time != None:
+                    module = imp.load_source("stencil_frame_watched", path)
+                module.frame_build(watch_options, ezcad)
+            except Exception:
+                traceback.print_exc()
+            else:
+                # Relaunch the viewer on the new assembly view:
+                status = "Rebuilt"
+                if options.viewer != None and not os.path.isfile(view_path):
+                    status = "Rebuilt without writing '{0}'".format(view_path)
+                elif options.viewer != None:
+                    if viewer != None and viewer.poll() == None:
+                        viewer.terminate()
+                        viewer.wait()
+                    viewer = subprocess.Popen(options.viewer.split() + [view_path])
+            modification_time = new_modification_time
+            print("{0} in {1:.2f}s, watching '{2}' (Control-C to stop)".format(status,
+              time.time() - start_time, path))
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        if viewer != None and viewer.poll() == None:
+            viewer.terminate()
+
+def hole_feature_get(kind, mode, depth):
+    """ Return the shared *HoleFeature* for a *kind* hole with *mode* that is *depth*
+        millimeters deep.
+    """
+
+    # Create the *HoleFeature* on first use:
+    assert isinstance(kind, str)
+    assert isinstance(mode, str)
+    key = (kind, mode, round(depth, 3))
+    hole_feature = hole_features.get(key)
+    if hole_feature == None:
+        hole_feature = HoleFeature(*key)
+        hole_features[key] = hole_feature
+    return hole_feature
+
+def length_exact(value):
+    """ Return the exact millimeter *Fraction* of *value*, which is an *L* or a plain number.
+    """
+
+    # Convert *value*:
+    if isinstance(value, ExactL):
+        exact = value.exact
+    elif isinstance(value, L):
+        exact = fractions.Fraction(repr(value.millimeters()))
+    elif isinstance(value, float):
+        exact = fractions.Fraction(repr(value))
+    else:
+        exact = fractions.Fraction(value)
+    return exact
+
+def length_parse(text):
+    """ Return the *L* object for *text*, which is a number followed by a "mm", "cm" or "in"
+        unit suffix.
+    """
+
+    # Split *text* into a number and a unit:
+    assert isinstance(text, str)
+    text = text.strip()
+    for suffix, unit in (("mm", "mm"), ("cm", "cm"), ("in", "inch"), ('"', "inch")):
+        if text.endswith(suffix):
+            number = text[:-len(suffix)].strip()
+            break
+    else:
+        raise ValueError("Length '{0}' does not end in mm, cm or in".format(text))
+
+    # Convert *number* into an *L* (only inches are allowed to be fractions):
+    try:
+        if unit == "inch" and "/" in number:
+            numerator, denominator = number.split("/")
+            float(numerator) / float(denominator)
+            length = L(inch=number)
+        else:
+            length = L(**{unit: float(number)})
+    except (ValueError, ZeroDivisionError):
+        raise ValueError("Length '{0}' has a bad number".format(text))
+    return length
+
+def material_get(generic, specific):
+    """ Return the shared *Material* for *generic* and *specific*.  *Material* objects are
+        created once and reused by every *Part*, pass and variant.
+    """
+
+    # Create the *Material* on first use:
+    assert isinstance(generic, str)
+    assert isinstance(specific, str)
+    key = (generic, specific)
+    material = materials.get(key)
+    if material == None:
+        material = Material(generic, specific)
+        materials[key] = material
+    return material
+
+def mesh_key_get(vertices, triangles):
+    """ Return a hashable key for the millimeter *vertices* and *triangles* of a mesh that
+        ignores vertex order and winding.
+    """
+
+    # Check argument types:
+    assert isinstance(vertices, list)
+    assert isinstance(triangles, list)
+
+    # Round the vertices and sort the corners of each triangle and then the triangles:
+    rounded = [tuple([int(math.floor(value * 1024.0 + 0.5)) for value in vertex])
+      for vertex in vertices]
+    if len(triangles) == 0:
+        return tuple(sorted(rounded))
+    return tuple(sorted([tuple(sorted([rounded[index] for index in triangle]))
+      for triangle in triangles]))
+
+def nest_pack(items, plate_dx, plate_dy, spacing, pitch, limit=8):
+    """ Pack *items* (a list of (*key*, *dx*, *dy*) footprints) onto *plate_dx* by *plate_dy*
+        plates and return one list of (*key*, *x*, *y*, *rotated*) per plate.
+    """
+
+    # Check argument types:
+    assert isinstance(items, list)
+
+    # Turn each item, then sort them tallest first:
+    snap = lambda value: value if pitch == 0.0 else math.ceil(value / pitch - 1.0e-9) * pitch
+    oriented = []
+    for key, dx, dy in items:
+        fits = lambda dx, dy: dx <= plate_dx and dy <= plate_dy
+        rotated = (dy > dx and fits(dy, dx)) or not fits(dx, dy)
+        if rotated:
+            dx, dy = dy, dx
+        assert fits(dx, dy), "{0} does not fit on the plate".format(key)
+        oriented.append((key, dx, dy, rotated))
+    oriented.sort(key=lambda item: (-item[2], -item[1]))
+
+    # Place each item on the first shelf with room, opening shelves and plates as needed.
+    # A shelf is an [*y*, *height*, *next_x*] list:
+    plates = []
+    for key, dx, dy, rotated in oriented:
+        placed = False
+        for placements, shelves in plates:
+            if limit != None and len(placements) >= limit:
+                continue
+            for shelf in shelves:
+                if dy <= shelf[1] and shelf[2] + dx <= plate_dx:
+                    placements.append((key, shelf[2], shelf[0], rotated))
+                    shelf[2] = snap(shelf[2] + dx + spacing)
+                    placed = True
+                    break
+            if not placed and len(shelves) > 0:
+                y = snap(shelves[-1][0] + shelves[-1][1] + spacing)
+                if y + dy <= plate_dy:
+                    shelves.append([y, dy, snap(dx + spacing)])
+                    placements.append((key, 0.0, y, rotated))
+                    placed = True
+            if placed:
+                break
+        if not placed:
+            plates.append(([(key, 0.0, 0.0, rotated)], [[0.0, dy, snap(dx + spacing)]]))
+    return [placements for placements, shelves in plates]
+
+def options_parse(arguments):
+    """ Return the options parsed from the command line *arguments* (e.g. *sys.argv[1:]*).
+    """
+
+    # Parse the command line arguments:
+    assert isinstance(arguments, list)
+    parser = argparse.ArgumentParser(description="Generate the stencil frame parts.")
+    parser.add_argument("--debug", action="store_true",
+      help="add the visualization debug pockets to the Parts")
+    parser.add_argument("--incremental", action="store_true",
+      help="only regenerate the Parts whose fingerprints changed since the last build")
+    parser.add_argument("--cache", default=".stencil_frame_cache.json",
+      help="the build cache file used by --incremental")
+    parser.add_argument("--store",
+      help="a content addressed artifact directory shared between runs, variants and machines")
+    parser.add_argument("--part", action="append",
+      help="only generate this Part (repeatable) and construct only the Parts it reads")
+    parser.add_argument("--jobs", type=int, default=1,
+      help="the number of worker processes used to generate the Parts")
+    parser.add_argument("--trace-solve", action="store_true",
+      help="report the passes, changed values and time of each Part's construct()")
+    parser.add_argument("--fast-solve", action="store_true",
+      help="replay the previous construct() of Parts whose inputs have not changed")
+    parser.add_argument("--lengths", choices=("auto", "exact", "float"), default="auto",
+      help="the offline solve length arithmetic: exact (rational), float or auto (float for "
+      "--sweep and exact otherwise)")
+    parser.add_argument("--schedule", action="store_true",
+      help="reorder the operations of each setup to avoid tool changes and shorten rapids")
+    parser.add_argument("--schedule-report", action="store_true",
+      help="report the tool changes, estimated cycle time and air milling of each Part")
+    parser.add_argument("--estimate", action="store_true",
+      help="only solve the dimensions (without EZCAD3) and report the estimated machining time")
+    parser.add_argument("--outputs", default="cnc,wrl",
+      help="the comma separated outputs to produce: cnc, wrl, gltf, report, estimate, nest, "
+      "clearance, bom and/or holes")
+    parser.add_argument("--no-render", action="store_true",
+      help="leave wrl out of --outputs")
+    parser.add_argument("--plate-dx", default="12in",
+      help="the usable tooling plate width for the nest output (e.g. 12in)")
+    parser.add_argument("--plate-dy", default="6in",
+      help="the usable tooling plate height for the nest output (e.g. 6in)")
+    parser.add_argument("--nest-copies", type=int, default=1,
+      help="the number of frames whose tooling plate Parts are nested together")
+    parser.add_argument("--bom-sheet", default="24in,12in",
+      help="the dx,dy of the stock sheets that the bom output cuts pieces from")
+    parser.add_argument("--bom-bar",
+      help="the width,length of bar stock for bom pieces no wider than the width (e.g. 2in,48in)")
+    parser.add_argument("--bom-copies", type=int, default=1,
+      help="the number of frames (of each --batch variant) that the bom output covers")
+    parser.add_argument("--air-clip", action="store_true",
+      help="lower the top of pockets whose footprint was already cleared by earlier pockets")
+    parser.add_argument("--stencil-dx", default="15cm",
+      help="the unfolded stencil width (e.g. 15cm, 5.9in)")
+    parser.add_argument("--stencil-dy", default="10cm",
+      help="the stencil height (e.g. 10cm, 4in)")
+    parser.add_argument("--stencil-thickness", default="0.12mm",
+      help="the stencil thickness (e.g. 0.12mm)")
+    parser.add_argument("--stencil-fold", default="1/4in",
+      help="the amount folded down on the east and west stencil edges (e.g. 1/4in)")
+    parser.add_argument("--set", action="append",
+      help="override a design parameter (repeatable), e.g. East_Edge.east_dx=1.5in")
+    parser.add_argument("--sweep", action="append",
+      help="sweep a design parameter (repeatable) over a list (East_Edge.east_dx=1in,1.5in) "
+      "or an inclusive start:stop:step range (Bottom_Clamp.west_dx=0.75in:1.25in:0.125in)")
+    parser.add_argument("--sweep-build", type=int, default=0,
+      help="build the --outputs of this many of the best --sweep results into sweep/")
+    parser.add_argument("--batch",
+      help="a CSV file of name,dx,dy,thickness,fold_amount stencil variants to build")
+    parser.add_argument("--batch-directory", default="variants",
+      help="the directory that receives one sub-directory per --batch variant")
+    parser.add_argument("--watch", action="store_true",
+      help="stay running and rebuild incrementally every time stencil_frame.py is saved")
+    parser.add_argument("--watch-interval", type=float, default=0.2,
+      help="the number of seconds between --watch checks for a changed stencil_frame.py")
+    parser.add_argument("--viewer",
+      help="a viewer command (e.g. view3dscene) that --watch relaunches on the new assembly")
+    parser.add_argument("--time-startup", action="store_true",
+      help="report how long importing this file and each module it pulls in takes")
+    parser.add_argument("--profile",
+      help="profile every Part operation and write a collapsed stack file here at exit")
+    parser.add_argument("--benchmark",
+      help="time the build phases of the benchmark variants into this .json or .csv file")
+    parser.add_argument("--benchmark-baseline",
+      help="a previous --benchmark file to check the new timings against")
+    parser.add_argument("--benchmark-threshold", type=float, default=0.10,
+      help="the fractional slow down over --benchmark-baseline that counts as a regression")
+    options = parser.parse_args(arguments)
+    assert options.jobs >= 1, "--jobs must be at least 1"
+    assert options.nest_copies >= 1, "--nest-copies must be at least 1"
+    assert options.bom_copies >= 1, "--bom-copies must be at least 1"
+    for text in [options.stencil_dx, options.stencil_dy, options.stencil_thickness,
+      options.stencil_fold, options.plate_dx, options.plate_dy] + options.bom_sheet.split(",") + (
+      [] if options.bom_bar == None else options.bom_bar.split(",")):
+        try:
+            length_parse(text)
+        except ValueError as error:
+            parser.error(str(error))
+    for name, text in (("--bom-sheet", options.bom_sheet), ("--bom-bar", options.bom_bar)):
+        if text != None and len(text.split(",")) != 2:
+            parser.error("{0} takes two comma separated lengths".format(name))
+    outputs = [output.strip() for output in options.outputs.split(",") if output.strip() != ""]
+    for output in outputs:
+        if not output in ("bom", "clearance", "cnc", "estimate", "gltf", "holes", "nest",
+          "report", "wrl"):
+            parser.error("Unknown output '{0}' in --outputs".format(output))
+    if options.estimate:
+        outputs = ["estimate"]
+    if options.no_render and "wrl" in outputs:
+        outputs.remove("wrl")
+    options.outputs = outputs
+    if options.store != None:
+        options.store = os.path.abspath(options.store)
+    if options.lengths == "auto":
+        options.lengths = "float" if options.sweep != None else "exact"
+    for text in (options.set or []) + (options.sweep or []):
+        try:
+            parameter_parse(text)
+        except ValueError as error:
+            parser.error(str(error))
+    return options
+
+def parameter_parse(text):
+    """ Parse the design parameter setting *text* (e.g. "East_Edge.east_dx=1.5in") and return
+        a (*part_name*, *attribute*, *values*) tuple.
+    """
+
+    # Split *text* into its pieces:
+    assert isinstance(text, str)
+    if not "=" in text or not "." in text.split("=")[0]:
+        raise ValueError("Design parameter '{0}' is not {{part}}.{{attribute}}={{value}}".format(
+          text))
+    name, value_text = text.split("=", 1)
+    part_name, attribute = name.strip().split(".", 1)
+
+    # Expand either the range or the list:
+    if ":" in value_text:
+        pieces = value_text.split(":")
+        if len(pieces) != 3:
+            raise ValueError("Range '{0}' is not start:stop:step".format(value_text))
+        start, stop, step = [length_parse(piece).millimeters() for piece in pieces]
+        if step <= 0.0 or stop < start:
+            raise ValueError("Range '{0}' does not step up from start to stop".format(
+              value_text))
+        count = int(math.floor((stop - start) / step + 1.0e-6)) + 1
+        values = [L(mm=start + index * step) for index in range(count)]
+    else:
+        values = [length_parse(piece) for piece in value_text.split(",")]
+    return part_name, attribute, values
+
+def path_order(points, start=None):
+    """ Return the indices of *points* (a list of (x, y) tuples) in an order that keeps the
+        path through them from *start* short.
+    """
+
+    # Check argument types:
+    assert isinstance(points, list)
+    assert start == None or isinstance(start, tuple)
+
+    # Build the initial path by always moving to the nearest remaining point:
+    distance = lambda point1, point2: math.hypot(point1[0] - point2[0], point1[1] - point2[1])
+    remaining = range(len(points))
+    order = []
+    current = start
+    if current == None and len(remaining) > 0:
+        order.append(remaining.pop(0))
+        current = points[order[0]]
+    while len(remaining) > 0:
+        nearest = min(remaining, key=lambda index: distance(current, points[index]))
+        remaining.remove(nearest)
+        order.append(nearest)
+        current = points[nearest]
+
+    # Reverse sections of the path for as long as that makes it shorter:
+    first = 0 if start != None else 1
+    improved = True
+    while improved:
+        improved = False
+        for low in range(first, len(order) - 1):
+            previous = start if low == 0 else points[order[low - 1]]
+            for high in range(low + 1, len(order)):
+                after = None if high + 1 == len(order) else points[order[high + 1]]
+                old_length = distance(previous, points[order[low]])
+                new_length = distance(previous, points[order[high]])
+                if after != None:
+                    old_length += distance(points[order[high]], after)
+                    new_length += distance(points[order[low]], after)
+                if new_length < old_length - 1.0e-9:
+                    order[low:high + 1] = order[low:high + 1][::-1]
+                    improved = True
+    return order
+
+def profile_merge(profiles):
+    """ Add *profiles*, a dictionary in the same form as *operation_profiles* (e.g. from a
+        *frame_job*() worker), into *operation_profiles*.
+    """
+
+    # Add up the counts, seconds and allocations of each key:
+    assert isinstance(profiles, dict)
+    for key, (count, seconds, allocations) in profiles.items():
+        profile = operation_profiles.setdefault(key, [0, 0.0, 0])
+        profile[0] += count
+        profile[1] += seconds
+        profile[2] += allocations
+
+def profile_write(path):
+    """ Write the *operation_profiles* to *path* in the collapsed stack format and print the
+        most expensive operations.
+    """
+
+    # Write the collapsed stacks:
+    assert isinstance(path, str)
+    keys = sorted(operation_profiles.keys())
+    with AtomicFile(path) as profile_file:
+        for key in keys:
+            stack, operation, comment = key
+            microseconds = int(round(operation_profiles[key][1] * 1000000.0))
+            profile_file.write("{0};{1};{2} {3}\n".format(stack, operation, comment,
+              microseconds))
+
+    # Print the twenty most expensive operations:
+    print("{0:<40} {1:>7} {2:>10} {3:>11}".format("Part/Operation", "Calls", "Total ms",
+      "~GC objects"))
+    keys.sort(key=lambda key: -operation_profiles[key][1])
+    for key in keys[:20]:
+        count, seconds, allocations = operation_profiles[key]
+        print("{0:<40} {1:>7} {2:>10.3f} {3:>11}".format(
+          key[0].split(";")[-1] + "/" + key[2], count, seconds * 1000.0, allocations))
+    print("(~GC objects is the net change in gc.get_count(), only a rough allocation proxy)")
+    print("Wrote {0} profile entries to '{1}'".format(len(keys), path))
+
+def program_line_strip(line):
+    """ Return the G-code *line* without its work offset selections and program ends along
+        with the number of program ends that were removed.
+    """
+
+    # Check argument types:
+    assert isinstance(line, str)
+
+    # Strip the words from the code between the comments and names:
+    ends = 0
+    pieces = re.split(r"(\([^)]*\)|<[^>]*>|;.*)", line.strip())
+    for index in range(0, len(pieces), 2):
+        code = re.sub(r"(?i)(?<![a-z])G\s*0*5[4-9](\.[1-3])?(?![\d.])", "", pieces[index])
+        code, count = re.subn(r"(?i)(?<![a-z])M\s*0*(2|30)(?![\d.])", "", code)
+        pieces[index] = re.sub(r"[ \t]+", " ", code)
+        ends += count
+    return "".join(pieces).strip(), ends
+
+def setup_program_find(part_name, setup_name):
+    """ Return the path of the program that EZCAD3 wrote for the *setup_name* setup of the
+        *part_name* *Part*, or *None* if there is none.
+    """
+
+    # Check argument types:
+    assert isinstance(part_name, str)
+    assert isinstance(setup_name, str)
+
+    # Walk the current directory in a deterministic order looking for the program:
+    part_key = "".join([c for c in part_name.lower() if c.isalnum()])
+    setup_key = "".join([c for c in setup_name.lower() if c.isalnum()])
+    for directory, sub_directories, file_names in os.walk("."):
+        sub_directories[:] = sorted([name for name in sub_directories
+          if directory != "." or not name in ("holes", "nest", "sweep")])
+        for file_name in sorted(file_names):
+            if file_name.lower().endswith(".ngc"):
+                path = os.path.relpath(os.path.join(directory, file_name))
+                with open(path) as program_file:
+                    header = "".join([program_file.readline() for index in range(20)])
+                name_key = "".join([c for c in file_name.lower() if c.isalnum()])
+                header_key = "".join([c for c in header.lower() if c.isalnum()])
+                if (part_key + setup_key in name_key or
+                  (part_key in header_key and setup_key in header_key)):
+                    return path
+    return None
+
+def startup_report():
+    """ Import this file in a fresh interpreter and print the time of the slowest modules that
+        it pulls in.
+    """
+
+    import subprocess
+
+    # Time the bare interpreter start up:
+    start_time = time.time()
+    subprocess.check_call([sys.executable, "-c", "pass"])
+    interpreter_time = time.time() - start_time
+
+    # The fresh interpreter wraps *__import__*() to time the first import of each module and
+    # subtracts the time of the imports nested inside of it to get its own time:
+    script = "\n".join([
+      "import __builtin__, sys, time",
+      "original_import = __builtin__.__import__",
+      "nested_times = [0.0]",
+      "times = {}",
+      "def timed_import(name, *arguments):",
+      "    if name in sys.modules:",
+      "        return original_import(name, *arguments)",
+      "    nested_times.append(0.0)",
+      "    start_time = time.time()",
+      "    try:",
+      "        return original_import(name, *arguments)",
+      "    finally:",
+      "        total_time = time.time() - start_time",
+      "        own_time = total_time - nested_times.pop()",
+      "        nested_times[-1] += total_time",
+      "        if not name in times:",
+      "            times[name] = (total_time, own_time)",
+      "__builtin__.__import__ = timed_import",
+      "import stencil_frame",
+      "for name, module_times in times.items():",
+      "    print('{0} {1} {2}'.format(name, *module_times))"])
+    directory = os.path.dirname(os.path.abspath(__file__))
+    times = {}
+    # (*-B* keeps the child from caching a compiled copy, since a script run as a program is
+    # always compiled from scratch too):
+    output = subprocess.check_output([sys.executable, "-B", "-c", script], cwd=directory)
+    for line in output.split("\n"):
+        fields = line.split()
+        if len(fields) == 3:
+            times[fields[0]] = (float(fields[1]), float(fields[2]))
+
+    # Print the slowest modules:
+    print("{0:<24} {1:>10} {2:>10}".format("Module", "Total ms", "Own ms"))
+    for name, module_times in sorted(times.items(), key=lambda item: -item[1][0])[:20]:
+        print("{0:<24} {1:>10.2f} {2:>10.2f}".format(name, module_times[0] * 1000.0,
+          module_times[1] * 1000.0))
+    print("{0:<24} {1:>10.2f}".format("Interpreter start up", interpreter_time * 1000.0))
+
+def umask_get():
+    """ Return the current file creation mask.
+    """
+
+    # *umask*() can only be read by setting it:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+def value_canonical(value, depth=0):
+    """ Return a canonical text representation of *value* suitable for fingerprinting.
+    """
+
+    # Check argument types:
+    assert isinstance(depth, int)
+
+    # Dispatch on the type of *value*:
+    if isinstance(value, BasePart):
+        text = "Part:" + value.part_name
+    elif value == None or isinstance(value, (bool, int, long, float, str)):
+        text = repr(value)
+    elif isinstance(value, ExactL):
+        text = "{0}mm".format(value.exact)
+    elif isinstance(value, L):
+        text = "{0:.6f}mm".format(value.millimeters())
+    elif isinstance(value, P):
+        text = "P({0},{1},{2})".format(value_canonical(value.x), value_canonical(value.y),
+          value_canonical(value.z))
+    elif isinstance(value, (list, tuple)):
+        text = "(" + ",".join([value_canonical(item, depth) for item in value]) + ")"
+    elif isinstance(value, dict):
+        text = "{" + ",".join([value_canonical(key, depth) + ":" +
+          value_canonical(value[key], depth) for key in sorted(value.keys())]) + "}"
+    elif depth >= 2 or isinstance(value, Part):
+        text = value.__class__.__name__
+    else:
+        attributes = vars(value)
+        text = value.__class__.__name__ + "{" + ",".join([name + ":" +
+          value_canonical(attributes[name], depth + 1) for name in sorted(attributes.keys())
+          if not name.startswith("__")]) + "}"
+    return text
+
+def wrl_mesh_read(path):
+    """ Return the (*vertices*, *triangles*) mesh of the VRML file at *path*, or *None* when
+        there are no faces that can be read.
+    """
+
+    # Find the point and coordinate index lists, skipping comments:
+    assert isinstance(path, str)
+    if not os.path.isfile(path):
+        return None
+    with open(path) as wrl_file:
+        text = re.sub(r"#[^\n]*", "", wrl_file.read())
+    point_texts = re.findall(r"\bpoint\s*\[([^\]]*)\]", text)
+    index_texts = re.findall(r"\bcoordIndex\s*\[([^\]]*)\]", text)
+    if len(point_texts) == 0 or len(point_texts) != len(index_texts):
+        return None
+
+    # Convert each face set, closing the final polygon even without a trailing -1:
+    vertices = []
+    triangles = []
+    try:
+        for point_text, index_text in zip(point_texts, index_texts):
+            numbers = [float(number) for number in point_text.replace(",", " ").split()]
+            base = len(vertices)
+            vertices.extend(zip(numbers[0::3], numbers[1::3], numbers[2::3]))
+            polygon = []
+            for index in [int(number) for number in index_text.replace(",", " ").split()] + [-1]:
+                if index >= 0:
+                    polygon.append(base + index)
+                    continue
+                triangles.extend([(polygon[0], polygon[corner], polygon[corner + 1])
+                  for corner in range(1, len(polygon) - 1)])
+                polygon = []
+    except ValueError:
+        return None
+    if len(triangles) == 0 or max([max(triangle) for triangle in triangles]) >= len(vertices):
+        return None
+    return vertices, triangles
+
+class ArtifactStore:
+    """ *ArtifactStore*: A content addressed directory of *Part* artifacts keyed by the *Part*
+	fingerprint.
+    """
+
+    def __init__(self, path):
+	""" *ArtifactStore*: Initialize the *ArtifactStore* object (i.e. *self*) to use the
+	    directory at *path* (which is created if needed.)
+	"""
+
+	# Make sure that the store directory exists:
+	assert isinstance(path, str)
+	artifact_store = self
+	artifact_store.path = path
+	if not os.path.isdir(path):
+	    os.makedirs(path)
+
+    def entry_path_get(self, fingerprint):
+	""" *ArtifactStore*: Return the directory of the *fingerprint* entry of the *ArtifactStore*
+	    object (i.e. *self*.)
+	"""
+
+	# Check argument types:
+	assert isinstance(fingerprint, str)
+
+	return os.path.join(self.path, fingerprint[:2], fingerprint)
+
+    def fetch(self, fingerprint, output_directory):
+	""" *ArtifactStore*: Copy the *fingerprint* entry artifacts into *output_directory* and
+	    return their paths, or *None* if there is no complete entry.
+	"""
+
+	# Check argument types:
+	assert isinstance(fingerprint, str)
+	assert isinstance(output_directory, str)
+
+	import json
+	import shutil
+
+	# Read the manifest of the entry and make sure that none of its files are missing:
+	artifact_store = self
+	entry_path = artifact_store.entry_path_get(fingerprint)
+	manifest_path = os.path.join(entry_path, "manifest.json")
+	if not os.path.isfile(manifest_path):
+	    return None
+	with open(manifest_path) as manifest_file:
+	    artifacts = [str(path) for path in json.load(manifest_file)["artifacts"]]
+	if len(artifacts) == 0 or not all(
+	  [os.path.isfile(os.path.join(entry_path, "files", path)) for path in artifacts]):
+	    return None
+
+	# Copy each artifact out of the entry:
+	for path in artifacts:
+	    stored_path = os.path.join(entry_path, "files", path)
+	    output_path = os.path.join(output_directory, path)
+	    if not os.path.isdir(os.path.dirname(output_path)):
+		os.makedirs(os.path.dirname(output_path))
+	    with open(stored_path, "rb") as stored_file:
+		with AtomicFile(output_path, "wb") as output_file:
+		    shutil.copyfileobj(stored_file, output_file)
+	return artifacts
+
+    def put(self, fingerprint, source_directory, artifacts):
+	""" *ArtifactStore*: Add the *artifacts* in *source_directory* to the *ArtifactStore*
+	    object (i.e. *self*) as the *fingerprint* entry.
+	"""
+
+	# Check argument types:
+	assert isinstance(fingerprint, str)
+	assert isinstance(source_directory, str)
+	assert isinstance(artifacts, list)
+
+	import json
+	import shutil
+	import tempfile
+
+	# Nothing to do for an empty or already present entry:
+	artifact_store = self
+	entry_path = artifact_store.entry_path_get(fingerprint)
+	if len(artifacts) == 0 or os.path.isdir(entry_path):
+	    return
+	if not os.path.isdir(os.path.dirname(entry_path)):
+	    try:
+		os.makedirs(os.path.dirname(entry_path))
+	    except OSError:
+		pass
+
+	# Copy the artifacts into a temporary entry next to the real one:
+	temporary_path = tempfile.mkdtemp(prefix="." + fingerprint + ".",
+	  dir=os.path.dirname(entry_path))
+	try:
+	    for path in artifacts:
+		stored_path = os.path.join(temporary_path, "files", path)
+		if not os.path.isdir(os.path.dirname(stored_path)):
+		    os.makedirs(os.path.dirname(stored_path))
+		shutil.copyfile(os.path.join(source_directory, path), stored_path)
+	    with open(os.path.join(temporary_path, "manifest.json"), "w") as manifest_file:
+		json.dump({"artifacts": artifacts}, manifest_file, indent=2, sort_keys=True)
+		manifest_file.write("\n")
+
+	    # Move the entry into place unless another build beat us to it:
+	    os.chmod(temporary_path, 0777 & ~umask_get())
+	    os.rename(temporary_path, entry_path)
+	except OSError:
+	    if not os.path.isdir(entry_path):
+		raise
+	finally:
+	    if os.path.isdir(temporary_path):
+		shutil.rmtree(temporary_path)
+
+class AtomicFile:
+    """ *AtomicFile*: A file that is written to a temporary file and renamed into place when
+	the `with` block finishes without an exception.
+    """
+
+    def __init__(self, path, mode="w"):
+	""" *AtomicFile*: Initialize the *AtomicFile* object (i.e. *self*) to write *path* with
+	    *mode* ("w" or "wb".)
+	"""
+
+	# Check argument types:
+	assert isinstance(path, str)
+	assert mode in ("w", "wb")
+
+	# Remember the arguments until *__enter__*():
+	atomic_file = self
+	atomic_file.file = None
+	atomic_file.mode = mode
+	atomic_file.path = path
+	atomic_file.temporary_path = None
+
+    def __enter__(self):
+	""" *AtomicFile*: Open and return the temporary file of the *AtomicFile* object (i.e.
+	    *self*.)
+	"""
+
+	import tempfile
+
+	# Create the temporary file next to *path* so that the rename stays on one file system:
+	atomic_file = self
+	directory, base_name = os.path.split(os.path.abspath(atomic_file.path))
+	descriptor, atomic_file.temporary_path = tempfile.mkstemp(prefix="." + base_name + ".",
+	  dir=directory)
+	atomic_file.file = os.fdopen(descriptor, atomic_file.mode)
+	return atomic_file.file
+
+    def __exit__(self, exception_type, exception_value, exception_traceback):
+	""" *AtomicFile*: Close the temporary file of the *AtomicFile* object (i.e. *self*) and
+	    rename it into place, or remove it if the `with` block raised an exception.
+	"""
+
+	# Flush everything to disk before the rename:
+	atomic_file = self
+	try:
+	    if exception_type == None:
+		atomic_file.file.flush()
+		os.fsync(atomic_file.file.fileno())
+	finally:
+	    atomic_file.file.close()
+
+	# Either move the new file into place or throw it away:
+	if exception_type == None:
+	    os.chmod(atomic_file.temporary_path, 0666 & ~umask_get())
+	    os.rename(atomic_file.temporary_path, atomic_file.path)
+	else:
+	    os.remove(atomic_file.temporary_path)
+	return False
+
+class BasePart(Part):
+    """ *BasePart*: The base class of every *Part* in the stencil frame.
+    """
+
+    def __init__(self, up, name):
+	""" *BasePart*: Initialize the *BasePart* object (i.e. *self*.)
+	"""
+
+	# Standard initialization sequence for *base_part*:
+	base_part = self
+	assert isinstance(up, Part) or up == None
+	assert isinstance(name, str) and not ' ' in name
+	Part.__init__(base_part, up, name)
+
+	# Stuff some bookkeeping values into *base_part*:
+	base_part.active_b   = True
+	base_part.needed_b   = True
+	base_part.operations = []
+	base_part.part_name  = name
+
+	# The offline solve bookkeeping (see *frame_offline_solve*()):
+	base_part.length_exact_b = False
+	base_part.offline_b      = False
+	base_part.offline_box    = None
+
+	# The stock removed by pockets so far (see *pocket_clip*()):
+	base_part.air_clip_b    = False
+	base_part.air_volume    = 0.0
+	base_part.stock_removed = []
+
+	# The operation scheduling and profiling bookkeeping (see *operations_flush*() and
+	# *operation_profile*()):
+	base_part.operation_order_b  = False
+	base_part.profile_b          = False
+	base_part.pending_operations = []
+	base_part.schedule_record    = [0, 0, 0.0, 0.0]
+	base_part.schedule_report_b  = False
+	base_part.schedule_tools     = [None, None]
+
+	# The *construct*() pass bookkeeping:
+	base_part.pass_records     = []
+	base_part.replay_signature = None
+	base_part.snapshot         = {}
+	base_part.solve_fast_b     = False
+	base_part.solve_trace_b    = False
+
+    def block(self, *arguments):
+	""" *BasePart*: Record and perform a *block* operation. """
+	self.operation_perform("block", Part.block, arguments)
+
+    def box_set(self, low, high):
+	""" *BasePart*: Set the bounding box of the *BasePart* object (i.e. *self*) to *low*
+	    through *high* during the offline solve.
+	"""
+
+	# Check argument types:
+	assert isinstance(low, tuple) and len(low) == 3
+	assert isinstance(high, tuple) and len(high) == 3
+
+	# Set the corners and the sizes:
+	base_part = self
+	length = ExactL if base_part.length_exact_b else lambda millimeters: L(mm=millimeters)
+	base_part.bsw = P(length(low[0]),  length(low[1]),  length(low[2]))
+	base_part.tne = P(length(high[0]), length(high[1]), length(high[2]))
+	base_part.dx  = length(high[0] - low[0])
+	base_part.dy  = length(high[1] - low[1])
+	base_part.dz  = length(high[2] - low[2])
+
+    def cnc_fence(self, *arguments):
+	""" *BasePart*: Record and perform a *cnc_fence* operation. """
+	self.operation_perform("cnc_fence", Part.cnc_fence, arguments)
+
+    def construct(self):
+	""" *BasePart*: Perform one *construct*() pass for the *BasePart* object (i.e. *self*).
+	"""
+
+	# Skip the *BasePart* entirely when nothing being generated reads it (see
+	# *frame_closure*()):
+	base_part = self
+	if not base_part.needed_b:
+	    return
+
+	# Compute the input signature when fast solving:
+	start_time = time.time()
+	signature = None
+	if base_part.solve_fast_b:
+	    signature = base_part.inputs_signature_get()
+
+	# Either replay the previous operations or run *construct_body*():
+	replayed = signature != None and signature == base_part.replay_signature
+	if replayed:
+	    operations = base_part.operations
+	    base_part.operations = []
+	    for name, arguments in operations:
+		base_part.operation_record(name, getattr(Part, name), arguments)
+	else:
+	    base_part.operations = []
+	    base_part.pending_operations = []
+	    base_part.schedule_record = [0, 0, 0.0, 0.0]
+	    base_part.schedule_tools = [None, None]
+	    base_part.air_volume = 0.0
+	    base_part.stock_removed = []
+	    base_part.replay_signature = None
+	    base_part.construct_body()
+	    base_part.operations_flush()
+	    base_part.replay_signature = signature
+
+	# Record the pass along with the values that changed when tracing:
+	changed_names = []
+	if base_part.solve_trace_b:
+	    snapshot = base_part.snapshot_get()
+	    previous_snapshot = base_part.snapshot
+	    changed_names = [name for name in sorted(snapshot.keys())
+	      if snapshot[name] != previous_snapshot.get(name)]
+	    base_part.snapshot = snapshot
+	base_part.pass_records.append((time.time() - start_time, replayed, changed_names))
 
-    # Create the *stencil_frame* assembly and process it:
-    stencil_frame = StencilFrame(None, "Stencil_Frame", debug=False)
-    stencil_frame.process(ezcad)
+    def contour(self, *arguments):
+	""" *BasePart*: Record and perform a *contour* operation. """
+	self.operation_perform("contour", Part.contour, arguments)
 
-class BottomClamp(Part):
+    def envelope_get(self):
+	""" *BasePart*: Return the (*low*, *high*) corners of the stock envelope of the *BasePart*
+	    object (i.e. *self*) or *None*.
+	"""
+
+	# Grow the envelope one *block* at a time:
+	base_part = self
+	low = high = None
+	for name, arguments in base_part.operations:
+	    if name == "block":
+		corners = [(corner.x.millimeters(), corner.y.millimeters(), corner.z.millimeters())
+		  for corner in arguments[3:5]]
+		corners += [] if low == None else [low, high]
+		low  = tuple([min([corner[axis] for corner in corners]) for axis in range(3)])
+		high = tuple([max([corner[axis] for corner in corners]) for axis in range(3)])
+	return None if low == None else (low, high)
+
+    def estimate_get(self):
+	""" *BasePart*: Return the estimated machining of the *BasePart* object (i.e. *self*) with
+	    one entry per setup.
+	"""
+
+	# Find the stock envelope from the *block* operations:
+	base_part = self
+	envelope = base_part.envelope_get()
+	if envelope == None:
+	    return []
+	low, high = envelope
+	size = [high[axis] - low[axis] for axis in range(3)]
+
+	# Walk the operations one setup at a time:
+	setups = []
+	setup = None
+	tool = None
+	position = None
+	for name, arguments in base_part.operations:
+	    # Start a new setup for each mount:
+	    if name in ("vice_mount", "tooling_plate_mount"):
+		setup = [arguments[0], 0.0, 0.0, 0, 0.0]
+		setups.append(setup)
+		position = None
+		continue
+	    if setup == None or name in ("block", "cnc_fence"):
+		continue
+
+	    # Estimate the cut length, feed, volume and position of the operation:
+	    cut_time = 0.0
+	    volume = 0.0
+	    center = None
+	    plunges = 1
+	    operation_tool = base_part.tool_get(name, arguments)
+	    if name == "tooling_plate_drill":
+		operation_tool = tooling_plate_tool
+		columns, rows, skips = arguments[1:4]
+		plunges = len(columns) * len(rows) - len(skips)
+		radius = drill_diameters[operation_tool] / 2.0
+		cut_time = plunges * size[2] / drill_feed
+		volume = plunges * math.pi * radius * radius * size[2]
+	    elif name == "fasten":
+		region = base_part.operation_region_get(name, arguments)
+		if region != None:
+		    region_low, region_high, axis = region
+		    depth = max(0.0, min(region_high[axis], high[axis]) -
+		      max(region_low[axis], low[axis]))
+		    feature = hole_feature_get(base_part.up.fastener_locate(arguments[1])[0],
+		      arguments[2], depth)
+		    cut_time = feature.cut_time
+		    volume = feature.volume
+		    center = region_low
+	    else:
+		feed, depth_of_cut = end_mill_feeds.get(operation_tool, (10.0, 1.0))
+		diameter = length_parse(operation_tool.split("_")[0]).millimeters()
+		if name == "simple_pocket":
+		    region_low, region_high, axis = base_part.operation_region_get(name, arguments)
+		    dx, dy, depth = [region_high[axis] - region_low[axis] for axis in range(3)]
+		    length = dx * dy / (0.4 * diameter) + 2 * (dx + dy)
+		    volume = dx * dy * depth
+		    center = tuple([(region_low[axis] + region_high[axis]) / 2.0
+		      for axis in range(3)])
+		elif name == "rectangular_contour":
+		    depth = size[2]
+		    length = 2 * (size[0] + size[1]) + math.pi * diameter
+		    volume = length * diameter * depth
+		else:
+		    contour, start, stop = arguments[1:4]
+		    depth = abs(stop.z.millimeters() - start.z.millimeters())
+		    length = contour.length_get() if isinstance(contour, TracedContour) else 0.0
+		    volume = length * diameter * depth
+		cut_time = math.ceil(depth / depth_of_cut) * length / feed
+
+	    # Tally the tool change, the cut, the plunges and the rapid from the previous cut:
+	    if operation_tool != tool:
+		setup[3] += 1
+		tool = operation_tool
+	    setup[1] += cut_time
+	    setup[2] += plunges * 2 * retract_height / rapid_speed
+	    if center != None and position != None:
+		setup[2] += math.sqrt(sum([(center[axis] - position[axis]) ** 2
+		  for axis in range(3)])) / rapid_speed
+	    position = center
+	    setup[4] += volume
+	return setups
+
+    def fasten(self, *arguments):
+	""" *BasePart*: Record and perform a *fasten* operation. """
+	self.operation_perform("fasten", Part.fasten, arguments)
+
+    def fingerprint_get(self):
+	""" *BasePart*: Return a fingerprint of the resolved inputs of the *BasePart* object
+	    (i.e. *self*.)
+	"""
+
+	import hashlib
+
+	# Hash the canonical representation of everything that goes into the artifacts:
+	base_part = self
+	sha1 = hashlib.sha1()
+	sha1.update(value_canonical((base_part.part_name, base_part.bsw, base_part.tne)))
+	for name, arguments in base_part.operations:
+	    sha1.update(value_canonical((name, arguments)))
+	    if name == "fasten":
+		sha1.update(value_canonical(base_part.up.fastener_locate(arguments[1])))
+	return sha1.hexdigest()
+
+    def grid_fasten(self, grid, mode, suffixes=None, labels=None):
+	""" *BasePart*: Fasten each *Fastener* in *grid* into the *BasePart* object (i.e. *self*)
+	    using *mode*.
+	"""
+
+	# Check argument types:
+	labels = {} if labels == None else labels
+	assert isinstance(grid, FastenerGrid)
+	assert isinstance(mode, str)
+	assert suffixes == None or isinstance(suffixes, tuple)
+	assert isinstance(labels, dict)
+
+	# Fan the *grid* holes out to *base_part*:
+	base_part = self
+	for suffix, name, fastener in grid.fasteners:
+	    if suffixes == None or suffix in suffixes:
+		base_part.fasten(labels.get(name, name), fastener, mode)
+
+    def grids_get(self):
+	""" *BasePart*: Return the list of *FastenerGrid*'s that the *BasePart* object (i.e. *self*)
+	    drills, or *None* if they are not known.
+	"""
+
+	return None
+
+    def holes_get(self):
+	""" *BasePart*: Return the holes that the *BasePart* object (i.e. *self*) drills as a list
+	    of (*setup_name*, *hole_feature*, *entry*, *axis*) tuples.
+	"""
+
+	# Find the stock envelope:
+	base_part = self
+	envelope = base_part.envelope_get()
+	if envelope == None:
+	    return []
+	low, high = envelope
+
+	# Turn each located *fasten* into a hole of the current setup:
+	holes = []
+	setup_name = None
+	for name, arguments in base_part.operations:
+	    if name in ("vice_mount", "tooling_plate_mount"):
+		setup_name = arguments[0]
+	    elif name == "fasten":
+		region = base_part.operation_region_get(name, arguments)
+		if region != None:
+		    region_low, region_high, axis = region
+		    top = min(region_high[axis], high[axis])
+		    depth = max(0.0, top - max(region_low[axis], low[axis]))
+		    feature = hole_feature_get(base_part.up.fastener_locate(arguments[1])[0],
+		      arguments[2], depth)
+		    entry = list(region_low)
+		    entry[axis] = top
+		    holes.append((setup_name, feature, tuple(entry), axis))
+	return holes
+
+    def inputs_get(self):
+	""" *BasePart*: Return the list of *Part*'s that the *BasePart* object (i.e. *self*) reads,
+	    or *None* if they are not known.
+	"""
+
+	return None
+
+    def inputs_signature_get(self):
+	""" *BasePart*: Return a signature of the current values of the inputs of the
+	    *BasePart* object (i.e. *self*), or *None* if its inputs are not known.
+	"""
+
+	# Concatenate the snapshots of the inputs:
+	base_part = self
+	inputs = base_part.inputs_get()
+	if inputs == None:
+	    return None
+	return "|".join([value_canonical(input.snapshot_get()) for input in inputs])
+
+    def mount_axis_get(self):
+	""" *BasePart*: Return the (*axis*, *sign*) that the top face of the latest *vice_mount* of
+	    the *BasePart* object (i.e. *self*) looks along.
+	"""
+
+	# Find the top face of the latest *vice_mount*:
+	base_part = self
+	top_face = "t"
+	for name, arguments in base_part.operations:
+	    if name == "vice_mount":
+		top_face = arguments[1]
+	return {"t": (2, 1), "b": (2, -1), "n": (1, 1), "s": (1, -1), "e": (0, 1),
+	  "w": (0, -1)}[top_face]
+
+    def operation_perform(self, name, method, arguments):
+	""" *BasePart*: Record the operation *name* with *arguments* and invoke *method* to
+	    perform it.
+	"""
+
+	# Check argument types:
+	assert isinstance(name, str)
+	assert isinstance(arguments, tuple)
+
+	# Hold back the machining operations of the current setup (see *operations_flush*()):
+	base_part = self
+	if name in ("contour", "fasten", "rectangular_contour", "simple_pocket"):
+	    base_part.pending_operations.append((name, method, arguments))
+	    return
+
+	# Any other operation ends the setup, so perform the held back operations first:
+	base_part.operations_flush()
+	base_part.operation_record(name, method, arguments)
+
+    def operation_profile(self, name, method, arguments):
+	""" *BasePart*: Invoke *method* to perform the operation *name* and add its time and a
+	    rough allocation proxy to the *operation_profiles*.
+	"""
+
+	# Build the key from the assembly stack and the operation comment (if any):
+	base_part = self
+	stack = []
+	part = base_part
+	while isinstance(part, BasePart):
+	    stack.insert(0, part.part_name)
+	    part = part.up
+	comment = arguments[0] if len(arguments) > 0 and isinstance(arguments[0], str) else name
+	key = (";".join(stack), name, comment)
+
+	# Perform the operation with the collector paused, so that the generation 0 count only
+	# changes by the tracked containers created minus those freed (a rough allocation proxy):
+	collector_enabled = gc.isenabled()
+	gc.disable()
+	allocations = gc.get_count()[0]
+	start_time = time.time()
+	try:
+	    method(base_part, *arguments)
+	finally:
+	    seconds = time.time() - start_time
+	    allocations = gc.get_count()[0] - allocations
+	    if collector_enabled:
+		gc.enable()
+
+	# Accumulate the profile entry:
+	profile = operation_profiles.setdefault(key, [0, 0.0, 0])
+	profile[0] += 1
+	profile[1] += seconds
+	profile[2] += allocations
+
+    def operation_record(self, name, method, arguments):
+	""" *BasePart*: Record the operation *name* with *arguments* and invoke *method* to
+	    perform it when needed.
+	"""
+
+	# Record the operation:
+	base_part = self
+	base_part.operations.append((name, arguments))
+
+	# When offline, only grow the bounding box for a *block*:
+	if base_part.offline_b:
+	    if name == "block":
+		box = base_part.offline_box
+		millimeters = length_exact if base_part.length_exact_b else L.millimeters
+		corners = [(millimeters(corner.x), millimeters(corner.y), millimeters(corner.z))
+		  for corner in arguments[3:5]] + ([] if box == None else list(box))
+		base_part.offline_box = (
+		  tuple([min([corner[axis] for corner in corners]) for axis in range(3)]),
+		  tuple([max([corner[axis] for corner in corners]) for axis in range(3)]))
+	    return
+
+	# Perform the operation if *base_part* is active:
+	if base_part.active_b or name == "block":
+	    if base_part.profile_b:
+		base_part.operation_profile(name, method, arguments)
+	    else:
+		method(base_part, *arguments)
+
+    def operation_region_get(self, name, arguments):
+	""" *BasePart*: Return the region that the operation *name* with *arguments* cuts in the
+	    *BasePart* object (i.e. *self*), or *None* if it is not known.
+	"""
+
+	# Check argument types:
+	assert isinstance(name, str)
+	assert isinstance(arguments, tuple)
+
+	# Extract the corners of a pocket or the end points of a hole:
+	base_part = self
+	axis = 2
+	if name == "simple_pocket":
+	    point1, point2 = arguments[1], arguments[2]
+	elif name == "fasten":
+	    location = base_part.up.fastener_locate(arguments[1])
+	    if location == None:
+		return None
+	    kind, point1, point2 = location
+	else:
+	    return None
+
+	# Convert to millimeters and find the axis of a hole (i.e. its longest span):
+	point1 = (point1.x.millimeters(), point1.y.millimeters(), point1.z.millimeters())
+	point2 = (point2.x.millimeters(), point2.y.millimeters(), point2.z.millimeters())
+	if name == "fasten":
+	    spans = [abs(point2[index] - point1[index]) for index in range(3)]
+	    axis = spans.index(max(spans))
+	low  = tuple([min(point1[index], point2[index]) for index in range(3)])
+	high = tuple([max(point1[index], point2[index]) for index in range(3)])
+	return low, high, axis
+
+    def operations_flush(self):
+	""" *BasePart*: Perform the held back machining operations of the *BasePart* object
+	    (i.e. *self*).
+	"""
+
+	# Grab the held back operations:
+	base_part = self
+	pending = base_part.pending_operations
+	base_part.pending_operations = []
+	size = len(pending)
+	if size == 0:
+	    return
+
+	# Only schedule the operations for *--schedule* and *--schedule-report*:
+	order = range(size)
+	if base_part.operation_order_b or base_part.schedule_report_b:
+	    schedule_order = base_part.operations_schedule(pending)
+	    if base_part.operation_order_b:
+		order = schedule_order
+
+	# Perform the operations, clipping the pocket air when requested:
+	for index in order:
+	    name, method, arguments = pending[index]
+	    if name == "simple_pocket" and base_part.air_clip_b:
+		arguments = base_part.pocket_clip(arguments)
+	    if arguments != None:
+		base_part.operation_record(name, method, arguments)
+
+    def operations_schedule(self, pending):
+	""" *BasePart*: Return the order that the *pending* operations of the *BasePart* object
+	    (i.e. *self*) are scheduled in to minimize tool changes.
+	"""
+
+	# Check argument types:
+	assert isinstance(pending, list)
+
+	# Find the tool and the region of each operation:
+	base_part = self
+	size = len(pending)
+	tools   = [base_part.tool_get(name, arguments) for name, method, arguments in pending]
+	regions = [base_part.operation_region_get(name, arguments)
+	  for name, method, arguments in pending]
+
+	# Find the earlier operations that each operation must follow.  Two operations conflict
+	# when their regions overlap across the axis of the hole (or across Z for two pockets):
+	clearance = 2.0
+	def conflicts(earlier, later):
+	    if regions[earlier] == None or regions[later] == None:
+		return True
+	    axis = regions[later][2] if pending[later][0] == "fasten" else regions[earlier][2]
+	    low1, high1, axis1 = regions[earlier]
+	    low2, high2, axis2 = regions[later]
+	    for index in range(3):
+		if index != axis and (low1[index] > high2[index] + clearance or
+		  low2[index] > high1[index] + clearance):
+		    return False
+	    return True
+	predecessors = [set([earlier for earlier in range(index) if conflicts(earlier, index)])
+	  for index in range(size)]
+
+	# Schedule the operations, staying with the tool in the spindle while possible:
+	order = []
+	done = set()
+	tool = base_part.schedule_tools[1]
+	while len(order) < size:
+	    ready = [index for index in range(size)
+	      if not index in done and predecessors[index] <= done]
+	    same = [index for index in ready if tools[index] == tool]
+	    index = same[0] if len(same) > 0 else ready[0]
+	    tool = tools[index]
+	    order.append(index)
+	    done.add(index)
+
+	# Order each run of holes that share a drill along a short path:
+	low = 0
+	while low < size:
+	    high = low
+	    while (high < size and pending[order[high]][0] == "fasten" and
+	      tools[order[high]] == tools[order[low]]):
+		high += 1
+	    if high - low > 1:
+		located = [index for index in order[low:high] if regions[index] != None]
+		points = [tuple([value for axis, value in enumerate(regions[index][0])
+		  if axis != regions[index][2]]) for index in located]
+		start = None
+		if len(located) > 0 and low > 0 and regions[order[low - 1]] != None:
+		    previous_low, previous_high, previous_axis = regions[order[low - 1]]
+		    start = tuple([(previous_low[axis] + previous_high[axis]) / 2.0
+		      for axis in range(3) if axis != regions[located[0]][2]])
+		unlocated = [index for index in order[low:high] if regions[index] == None]
+		order[low:high] = ([located[index] for index in path_order(points, start)] +
+		  unlocated)
+	    low = max(high, low + 1)
+
+	# Tally the tool changes and the rapid travel for both orders:
+	def tally(indices, tool):
+	    changes = 0
+	    travel = 0.0
+	    previous = None
+	    for index in indices:
+		if tools[index] != tool:
+		    changes += 1
+		    tool = tools[index]
+		region = regions[index]
+		center = None
+		if region != None:
+		    center = tuple([(region[0][axis] + region[1][axis]) / 2.0 for axis in range(3)])
+		if previous != None and center != None:
+		    travel += math.sqrt(sum([(center[axis] - previous[axis]) ** 2
+		      for axis in range(3)]))
+		previous = center
+	    return changes, travel, tool
+	source_changes, source_travel, source_tool = tally(range(size), base_part.schedule_tools[0])
+	schedule_changes, schedule_travel, schedule_tool = tally(order, base_part.schedule_tools[1])
+	record = base_part.schedule_record
+	record[0] += source_changes
+	record[1] += schedule_changes
+	record[2] += source_travel
+	record[3] += schedule_travel
+	base_part.schedule_tools = [source_tool, schedule_tool]
+	return order
+
+    def plate_footprint_get(self):
+	""" *BasePart*: Return the (*setup_name*, *dx*, *dy*) tooling plate footprint of the
+	    *BasePart* object (i.e. *self*), or *None*.
+	"""
+
+	# Find the *tooling_plate_mount* and the *vice_mount* that preceded it:
+	base_part = self
+	vice_arguments = None
+	for name, arguments in base_part.operations:
+	    if name == "vice_mount":
+		vice_arguments = arguments
+	    elif name == "tooling_plate_mount" and vice_arguments != None:
+		break
+	else:
+	    return None
+
+	# Drop the axis that the top face looks along and add the extra stock:
+	size = [base_part.dx.millimeters(), base_part.dy.millimeters(), base_part.dz.millimeters()]
+	top_axis = {"t": 2, "b": 2, "n": 1, "s": 1, "e": 0, "w": 0}[vice_arguments[1]]
+	del size[top_axis]
+	extras = [0.0, 0.0]
+	if len(vice_arguments) >= 6:
+	    extras = [vice_arguments[4].millimeters(), vice_arguments[5].millimeters()]
+	return (arguments[0], size[0] + 2 * extras[0], size[1] + 2 * extras[1])
+
+    def pocket_clip(self, arguments):
+	""" *BasePart*: Return the *simple_pocket* *arguments* with the pocket entry moved past
+	    any air, or *None* when the pocket is nothing but air.
+	"""
+
+	# Check argument types:
+	assert isinstance(arguments, tuple)
+
+	# Extract the pocket box in millimeters and the *L*'s of its ends along the cutter axis:
+	base_part = self
+	comment, corner1, corner2, radius = arguments[:4]
+	lengths1 = [corner1.x, corner1.y, corner1.z]
+	lengths2 = [corner2.x, corner2.y, corner2.z]
+	low  = tuple([min(lengths1[index].millimeters(), lengths2[index].millimeters())
+	  for index in range(3)])
+	high = tuple([max(lengths1[index].millimeters(), lengths2[index].millimeters())
+	  for index in range(3)])
+	radius = radius.millimeters()
+	axis, sign = base_part.mount_axis_get()
+	ends = sorted([lengths1[axis], lengths2[axis]], key=lambda length: length.millimeters())
+
+	# Measure depth along the cutter (i.e. *sign* times the *axis* coordinate) so that the
+	# entry is always the *top*.  Lower *top* for as long as an earlier pocket cleared the
+	# footprint just below it.  A smaller corner radius reaches into the corners that an
+	# earlier pocket left behind, so that is only allowed when the footprint stays clear of
+	# those corners:
+	epsilon = 1.0e-6
+	u, v = [index for index in range(3) if index != axis]
+	bottom, top = sorted([sign * low[axis], sign * high[axis]])
+	entry = top
+	top_length = None
+	lowered = True
+	while lowered:
+	    lowered = False
+	    for removed_low, removed_high, removed_radius, removed_axis, removed_ends in (
+	      base_part.stock_removed):
+		removed_bottom, removed_top = sorted([sign * removed_low[axis],
+		  sign * removed_high[axis]])
+		inside = (removed_low[u] <= low[u] + epsilon and
+		  high[u] <= removed_high[u] + epsilon and removed_low[v] <= low[v] + epsilon and
+		  high[v] <= removed_high[v] + epsilon)
+		corners_clear = (radius >= removed_radius - epsilon or
+		  (low[u] >= removed_low[u] + removed_radius and
+		   high[u] <= removed_high[u] - removed_radius) or
+		  (low[v] >= removed_low[v] + removed_radius and
+		   high[v] <= removed_high[v] - removed_radius))
+		if (removed_axis == axis and inside and corners_clear and
+		  removed_bottom < top - epsilon and removed_top >= top - epsilon):
+		    top = removed_bottom
+		    top_length = removed_ends[0] if sign > 0 else removed_ends[1]
+		    lowered = True
+
+	# Tally the air and remember the removed stock:
+	base_part.air_volume += ((high[u] - low[u]) * (high[v] - low[v]) *
+	  (entry - max(top, bottom)))
+	base_part.stock_removed.append((low, high, radius, axis, ends))
+
+	# Return the clipped pocket with its entry corner moved:
+	if top <= bottom + epsilon:
+	    return None
+	if top_length == None:
+	    return arguments
+	if sign * lengths1[axis].millimeters() > sign * lengths2[axis].millimeters():
+	    lengths1[axis] = top_length
+	    corner1 = P(*lengths1)
+	else:
+	    lengths2[axis] = top_length
+	    corner2 = P(*lengths2)
+	return (comment, corner1, corner2) + arguments[3:]
+
+    def rectangular_contour(self, *arguments):
+	""" *BasePart*: Record and perform a *rectangular_contour* operation. """
+	self.operation_perform("rectangular_contour", Part.rectangular_contour, arguments)
+
+    def simple_pocket(self, *arguments):
+	""" *BasePart*: Record and perform a *simple_pocket* operation. """
+	self.operation_perform("simple_pocket", Part.simple_pocket, arguments)
+
+    def snapshot_get(self):
+	""" *BasePart*: Return a dictionary of the canonical values of the dimensions of the
+	    *BasePart* object (i.e. *self*): its bounding box corners and its *L* attributes.
+	"""
+
+	# Grab the bounding box and every attribute with the *L* suffix:
+	base_part = self
+	snapshot = {"bsw": value_canonical(base_part.bsw), "tne": value_canonical(base_part.tne)}
+	for name, value in vars(base_part).items():
+	    if name.endswith("_l"):
+		snapshot[name] = value_canonical(value)
+	return snapshot
+
+    def stock_get(self):
+	""" *BasePart*: Return the (*material_name*, *thickness*, *dx*, *dy*) stock piece that the
+	    *BasePart* object (i.e. *self*) is cut from.
+	"""
+
+	# Find the vice mounts and the material of the first block:
+	base_part = self
+	vice_arguments = [arguments for name, arguments in base_part.operations
+	  if name == "vice_mount"]
+	material = [arguments[1] for name, arguments in base_part.operations if name == "block"][0]
+	material_names = [" ".join(key) for key, value in materials.items() if value is material]
+	material_name = material_names[0] if len(material_names) > 0 else "?"
+
+	# Split the bounding box into the thickness and the two other sides:
+	size = [base_part.dx.millimeters(), base_part.dy.millimeters(), base_part.dz.millimeters()]
+	top_axis = 2
+	if len(vice_arguments) > 0:
+	    top_axis = {"t": 2, "b": 2, "n": 1, "s": 1, "e": 0, "w": 0}[vice_arguments[0][1]]
+	thickness = size.pop(top_axis)
+	extras = [(arguments[4].millimeters(), arguments[5].millimeters())
+	  for arguments in vice_arguments if len(arguments) >= 6]
+	if len(extras) > 0:
+	    size = [size[0] + 2 * extras[0][0], size[1] + 2 * extras[0][1]]
+	return material_name, thickness, size[0], size[1]
+
+    def tool_get(self, name, arguments):
+	""" *BasePart*: Return the name of the tool that the operation *name* with *arguments*
+	    most likely uses.
+	"""
+
+	# Check argument types:
+	assert isinstance(name, str)
+	assert isinstance(arguments, tuple)
+
+	# Look up the drill of a hole:
+	base_part = self
+	if name == "fasten":
+	    location = base_part.up.fastener_locate(arguments[1])
+	    kind = "?" if location == None else location[0]
+	    mode = arguments[2]
+	    return drills.get((kind, mode), "{0}_{1}_Drill".format(kind, mode))
+
+	# Find the corner radius that bounds the end mill:
+	radius = None
+	if name == "rectangular_contour":
+	    radius = arguments[1]
+	elif name == "simple_pocket":
+	    radius = arguments[3]
+	elif name == "contour":
+	    radius = arguments[4] / 2
+	if radius == None:
+	    return name
+
+	# Pick the largest end mill that fits:
+	radius = radius.millimeters()
+	for diameter in end_mill_diameters:
+	    if length_parse(diameter).millimeters() / 2.0 <= radius + 1.0e-6:
+		break
+	return diameter + "_End_Mill"
+
+    def tooling_plate_drill(self, *arguments):
+	""" *BasePart*: Record and perform a *tooling_plate_drill* operation. """
+	self.operation_perform("tooling_plate_drill", Part.tooling_plate_drill, arguments)
+
+    def tooling_plate_mount(self, *arguments):
+	""" *BasePart*: Record and perform a *tooling_plate_mount* operation. """
+	self.operation_perform("tooling_plate_mount", Part.tooling_plate_mount, arguments)
+
+    def vice_mount(self, *arguments):
+	""" *BasePart*: Record and perform a *vice_mount* operation. """
+	self.operation_perform("vice_mount", Part.vice_mount, arguments)
+
+class BottomClamp(BasePart):
     """ *BottomClamp*: Represents the part that the *West_Clamp* screws into.
     """
 
@@ -45,10 +3064,14 @@ class BottomClamp(Part):
 	assert isinstance(up, Part) or up == None
 	assert isinstance(name, str) and not ' ' in name
 	assert isinstance(debug, bool)
-	Part.__init__(bottom_clamp, up, name)
+	BasePart.__init__(bottom_clamp, up, name)
 	bottom_clamp.debug_b = debug
 
-    def construct(self):
+	# The design parameters (see *--set* and *--sweep*):
+	bottom_clamp.west_dx_l = L(inch=1.000)
+
+
+    def construct_body(self):
 	""" *BottomClamp*: Construct the *BottomClamp* object.
 	"""
 
@@ -69,9 +3092,9 @@ class BottomClamp(Part):
 	stencil_tne         = stencil.tne
 	west_clamp_bsw      = west_clamp.bsw
 	west_clamp_tne      = west_clamp.tne
+	west_dx             = bottom_clamp.west_dx_l
 	
 	# Define some X coordinates:
-	west_dx = L(inch=1.000)
 	zero = L()
 	end_mill_radius = L(inch="1/2")
 	x21 = west_clamp_tne.x + end_mill_radius
@@ -97,8 +3120,8 @@ class BottomClamp(Part):
 	z0  = east_edge_bsw.z
 
 	# Start with a block of *material*:
-	material = Material("Plastic", "HDPE")
-	color = Color("lime")
+	material = material_get("Plastic", "HDPE")
+	color = color_get("lime")
 	corner1 = P(x0,  y1,  z0)
 	corner2 = P(x20, y19, z20)
 	bottom_clamp.block("Bottom_Clamp", material, color, corner1, corner2, "")
@@ -133,23 +3156,13 @@ class BottomClamp(Part):
 	bottom_clamp.simple_pocket("Stencil_Lock", corner1, corner2, radius, "")
 
 	# Drill the holes that join *west_clamp* to *bottom_clamp* (i.e. "wcbc"):
-	bottom_clamp.fasten("WCBC_NCE", stencil_frame.wcbc_nce_fastener_, "thread")
-	bottom_clamp.fasten("WCBC_NCW", stencil_frame.wcbc_ncw_fastener_, "thread")
-	bottom_clamp.fasten("WCBC_NE",  stencil_frame.wcbc_ne_fastener_,  "thread")
-	bottom_clamp.fasten("WCBC_NW",  stencil_frame.wcbc_nw_fastener_,  "thread")
-	bottom_clamp.fasten("WCBC_CE",  stencil_frame.wcbc_ce_fastener_,  "thread")
-	bottom_clamp.fasten("WCBC_CW",  stencil_frame.wcbc_cw_fastener_,  "thread")
-	bottom_clamp.fasten("WCBC_SCE", stencil_frame.wcbc_sce_fastener_, "thread")
-	bottom_clamp.fasten("WCBC_SCW", stencil_frame.wcbc_scw_fastener_, "thread")
-	bottom_clamp.fasten("WCBC_SE",  stencil_frame.wcbc_se_fastener_,  "thread")
-	bottom_clamp.fasten("WCBC_SW",  stencil_frame.wcbc_sw_fastener_,  "thread")
-
-	# Remount *bottom_clamp* so that west edge is facing up:
+	bottom_clamp.grid_fasten(stencil_frame.wcbc_grid, "thread")
+
+	# Remount *bottom_clamp* so that west edge is facing up.  These holes have always been
+	# labeled "WCBC_*" even though they take the "webc" screws:
 	bottom_clamp.vice_mount("West_Vice", "w", "b", "l")
-	bottom_clamp.fasten("WCBC_BN", stencil_frame.webc_bn_fastener_, "thread")
-	bottom_clamp.fasten("WCBC_BS", stencil_frame.webc_bs_fastener_, "thread")
-	bottom_clamp.fasten("WCBC_TN", stencil_frame.webc_tn_fastener_, "thread")
-	bottom_clamp.fasten("WCBC_TS", stencil_frame.webc_ts_fastener_, "thread")
+	bottom_clamp.grid_fasten(stencil_frame.webc_grid, "thread", labels={"WEBC_BN": "WCBC_BN",
+	  "WEBC_BS": "WCBC_BS", "WEBC_TN": "WCBC_TN", "WEBC_TS": "WCBC_TS"})
 
 	# Perform any requested visualization *debug*:
 	if debug:
@@ -159,8 +3172,140 @@ class BottomClamp(Part):
 	    corner2 = P(x20 + extra, y0 - extra, z20)
 	    bottom_clamp.simple_pocket("Debug", corner1, corner2, radius, "t")
 
+    def grids_get(self):
+	""" *BottomClamp*: Return the *FastenerGrid*'s drilled by *construct_body*(). """
+
+	stencil_frame = self.up
+	return [stencil_frame.wcbc_grid, stencil_frame.webc_grid]
+
+    def inputs_get(self):
+	""" *BottomClamp*: Return the *Part*'s read by *BottomClamp.construct_body*(). """
+
+	stencil_frame = self.up
+	return [stencil_frame.stencil_, stencil_frame.west_clamp_, stencil_frame.east_edge_]
+
+class BoxTree:
+    """ *BoxTree*: A bounding volume hierarchy over axis aligned boxes.
+    """
+
+    def __init__(self, boxes):
+	""" *BoxTree*: Initialize the *BoxTree* object (i.e. *self*) over *boxes*, a list of
+	    (*low*, *high*, *value*) tuples where *low* and *high* are (x, y, z) tuples.
+	"""
+
+	# Check argument types:
+	assert isinstance(boxes, list)
+
+	# Build the tree over every box:
+	box_tree = self
+	box_tree.boxes = boxes
+	box_tree.root = None if len(boxes) == 0 else box_tree.node_build(range(len(boxes)))
+
+    def node_build(self, indices):
+	""" *BoxTree*: Return a new node of the *BoxTree* object (i.e. *self*) over the boxes at
+	    *indices*.
+	"""
+
+	# Check argument types:
+	assert isinstance(indices, list)
+
+	# Find the bounds of the boxes:
+	boxes = self.boxes
+	low  = tuple([min([boxes[index][0][axis] for index in indices]) for axis in range(3)])
+	high = tuple([max([boxes[index][1][axis] for index in indices]) for axis in range(3)])
+	if len(indices) <= 4:
+	    return low, high, None, indices
+
+	# Split the boxes by their centers along the longest axis:
+	spans = [high[axis] - low[axis] for axis in range(3)]
+	axis = spans.index(max(spans))
+	indices = sorted(indices, key=lambda index: boxes[index][0][axis] + boxes[index][1][axis])
+	half = len(indices) // 2
+	return low, high, (self.node_build(indices[:half]), self.node_build(indices[half:])), None
+
+    def query(self, low, high):
+	""" *BoxTree*: Return the indices of the boxes of the *BoxTree* object (i.e. *self*)
+	    that touch or overlap the box from *low* to *high*.
+	"""
+
+	# Walk down every node whose bounds touch the box:
+	box_tree = self
+	touches = lambda low1, high1: all([low1[axis] <= high[axis] and low[axis] <= high1[axis]
+	  for axis in range(3)])
+	found = []
+	nodes = [] if box_tree.root == None else [box_tree.root]
+	while len(nodes) > 0:
+	    node_low, node_high, children, indices = nodes.pop()
+	    if touches(node_low, node_high):
+		if children == None:
+		    found += [index for index in indices
+		      if touches(box_tree.boxes[index][0], box_tree.boxes[index][1])]
+		else:
+		    nodes += children
+	return found
+
+class BuildCache:
+    """ *BuildCache*: Records the fingerprint and the artifacts of each *Part* from previous
+	builds so that unchanged *Part*'s need not be regenerated.
+    """
+
+    def __init__(self, path):
+	""" *BuildCache*: Initialize the *BuildCache* object (i.e. *self*) from the file at
+	    *path* (if it exists.)
+	"""
+
+	import json
+
+	# Load the previous entries from *path*:
+	assert isinstance(path, str)
+	build_cache = self
+	build_cache.path = path
+	build_cache.entries = {}
+	if os.path.isfile(path):
+	    with open(path) as cache_file:
+		build_cache.entries = json.load(cache_file)
+
+    def is_fresh(self, name, fingerprint):
+	""" *BuildCache*: Return *True* if the *Part* named *name* was last built with
+	    *fingerprint* and all of its artifacts are still present.
+	"""
+
+	# Check argument types:
+	assert isinstance(name, str)
+	assert isinstance(fingerprint, str)
+
+	# An entry is fresh only if it has artifacts and none of them have gone missing:
+	entry = self.entries.get(name)
+	return (entry != None and entry["fingerprint"] == fingerprint and
+	  len(entry["artifacts"]) > 0 and
+	  all([os.path.isfile(path) for path in entry["artifacts"]]))
+
+    def record(self, name, fingerprint, artifacts):
+	""" *BuildCache*: Record that the *Part* named *name* was built with *fingerprint*
+	    and produced *artifacts*.
+	"""
+
+	# Check argument types:
+	assert isinstance(name, str)
+	assert isinstance(fingerprint, str)
+	assert isinstance(artifacts, list)
+
+	# Replace any previous entry for *name*:
+	self.entries[name] = {"fingerprint": fingerprint, "artifacts": artifacts}
+
+    def save(self):
+	""" *BuildCache*: Write the *BuildCache* object (i.e. *self*) back out to its file.
+	"""
+
+	import json
+
+	# Write the entries out sorted so that the file is stable between builds:
+	build_cache = self
+	with AtomicFile(build_cache.path) as cache_file:
+	    json.dump(build_cache.entries, cache_file, indent=2, sort_keys=True)
+	    cache_file.write("\n")
 
-class Clamp(Part):
+class Clamp(BasePart):
     """ *Clamp*: Represents the east and west top stencil clamp:
     """
 
@@ -174,11 +3319,16 @@ class Clamp(Part):
 	assert isinstance(name, str) and not ' ' in name
 	assert isinstance(is_east, bool)
 	assert isinstance(debug, bool)
-	Part.__init__(clamp, up, name)
+	BasePart.__init__(clamp, up, name)
 	clamp.debug_b = debug
 	clamp.is_east_b = is_east
 
-    def construct(self):
+	# The design parameters (see *--set* and *--sweep*):
+	clamp.extra_dy_l  = L(inch="1/2")
+	clamp.plug_shim_l = L(inch=0.001)
+
+
+    def construct_body(self):
 	""" *Clamp*: Construct the *Clamp* object (i.e. *self*):
 	"""
 
@@ -195,9 +3345,10 @@ class Clamp(Part):
 	stencil_fold_amount = stencil.fold_amount_l
 	is_east             = clamp.is_east_b
 	debug               = clamp.debug_b
+	extra_dy            = clamp.extra_dy_l
+	plug_shim           = clamp.plug_shim_l
 	
 	# Compute some X coordinates:
-	plug_shim = L(inch=0.001)
 	zero = L()
 	dx = L(inch="3/4")
 	x20 = stencil_tne.x + dx/2
@@ -214,7 +3365,6 @@ class Clamp(Part):
 
 	# Compute some Y coordinates:
 	end_mill_radius = L(inch="1/2")
-	extra_dy = L(inch="1/2")
 	y20 = stencil_tne.y + extra_dy + end_mill_radius
 	y19 = stencil_tne.y + extra_dy
 	y18 = stencil_tne.y + extra_dy - plug_shim
@@ -230,8 +3380,8 @@ class Clamp(Part):
 	z0  = east_edge.bsw.z
 
 	# Create the *clamp* from a block of *material*:
-	material = Material("Plastic", "HDPE")
-	color = Color("purple")
+	material = material_get("Plastic", "HDPE")
+	color = color_get("purple")
 	if is_east:
 	    corner1 = P(x16, y1,  z0)
 	    corner2 = P(x20, y19, z20)	
@@ -269,25 +3419,15 @@ class Clamp(Part):
 	# Drill some holes for mounting the *camp* to either *east_edge* or *bottom_clamp*:
 	if is_east:
 	    # Drill holes for *east_clamp* and *east_edge* (i.e. "ecee") joining:
-	    clamp.fasten("ECEE_NCE", stencil_frame.ecee_nce_fastener_, "close")
-	    clamp.fasten("ECEE_NE",  stencil_frame.ecee_ne_fastener_,  "close")
-	    clamp.fasten("ECEE_NW",  stencil_frame.ecee_nw_fastener_,  "close")
-	    clamp.fasten("ECEE_CE",  stencil_frame.ecee_ce_fastener_,  "close")
-	    clamp.fasten("ECEE_SCE", stencil_frame.ecee_sce_fastener_, "close")
-	    clamp.fasten("ECEE_SE",  stencil_frame.ecee_se_fastener_,  "close")
-	    clamp.fasten("ECEE_SW",  stencil_frame.ecee_sw_fastener_,  "close")
+	    clamp.grid_fasten(stencil_frame.ecee_grid, "close",
+	      ("NCE", "NE", "NW", "CE", "SCE", "SE", "SW"))
         else:
 	    # Drill holes for *west_clamp* and *bottom_clamp* (i.e. "wcbc") joining:
-	    clamp.fasten("WCBC_NCW", stencil_frame.wcbc_ncw_fastener_, "close")
-	    clamp.fasten("WCBC_NE",  stencil_frame.wcbc_ne_fastener_,  "close")
-	    clamp.fasten("WCBC_NW",  stencil_frame.wcbc_nw_fastener_,  "close")
-	    clamp.fasten("WCBC_CW",  stencil_frame.wcbc_cw_fastener_,  "close")
-	    clamp.fasten("WCBC_SCW", stencil_frame.wcbc_scw_fastener_, "close")
-	    clamp.fasten("WCBC_SE",  stencil_frame.wcbc_se_fastener_,  "close")
-	    clamp.fasten("WCBC_SW",  stencil_frame.wcbc_sw_fastener_,  "close")
+	    clamp.grid_fasten(stencil_frame.wcbc_grid, "close",
+	      ("NCW", "NE", "NW", "CW", "SCW", "SE", "SW"))
 
 	# Mill out the stencil plug:
-	contour = Contour("Stencil_Plug")
+	contour = TracedContour("Stencil_Plug")
 	start = P(x0, y0, z0)
 	stop  = P(x0, y0, z10)
 	if is_east:
@@ -311,7 +3451,20 @@ class Clamp(Part):
 	    corner2 = P(x20 + extra, y0 - extra, z20)
 	    clamp.simple_pocket("Debug", corner1, corner2, end_mill_radius, "")
 
-class EastEdge(Part):
+    def grids_get(self):
+	""" *Clamp*: Return the *FastenerGrid*'s drilled by *Clamp.construct_body*(). """
+
+	clamp = self
+	stencil_frame = clamp.up
+	return [stencil_frame.ecee_grid if clamp.is_east_b else stencil_frame.wcbc_grid]
+
+    def inputs_get(self):
+	""" *Clamp*: Return the *Part*'s read by *Clamp.construct_body*(). """
+
+	stencil_frame = self.up
+	return [stencil_frame.east_edge_, stencil_frame.stencil_]
+
+class EastEdge(BasePart):
     """ *EastEdge*: Represents the main block of the frame:
     """
 
@@ -324,10 +3477,15 @@ class EastEdge(Part):
 	assert isinstance(up, Part) or up == None
 	assert isinstance(name, str) and not ' ' in name
 	assert isinstance(debug, bool)
-	Part.__init__(east_edge, up, name)
+	BasePart.__init__(east_edge, up, name)
 	east_edge.debug_b = debug
 
-    def construct(self):
+	# The design parameters (see *--set* and *--sweep*):
+	east_edge.east_dx_l = L(inch=1.250)
+	east_edge.west_dx_l = L(inch=1.500)
+
+
+    def construct_body(self):
 	""" *EastEdge*: Construct the *EastEdge* object (i.e. *self*):
 	"""
 
@@ -348,12 +3506,12 @@ class EastEdge(Part):
 	stencil_fold_amount           = stencil.fold_amount_l
 	stencil_frame_stock_thickness = stencil_frame.stock_thickness_l
 	debug                         = east_edge.debug_b
+	east_dx                       = east_edge.east_dx_l
+	west_dx                       = east_edge.west_dx_l
 
 	# Compute some X coordinates:
 	end_mill_radius = L(inch="1/2")
 	gap_dx = L(inch="1/4")
-	east_dx = L(inch=1.250)
-	west_dx = L(inch=1.500)
 	zero = L()
 	x20 = east_clamp_tne.x + east_dx
 	x15 = east_clamp_tne.x
@@ -383,8 +3541,8 @@ class EastEdge(Part):
 	east_edge.y_gap_l = y_gap = L(inch="1/2")
 
 	# Start with a block of *material*:
-	material = Material("Plastic", "HDPE")
-	color = Color("tan")
+	material = material_get("Plastic", "HDPE")
+	color = color_get("tan")
 	corner1 = P(x1,  y0,  z0)
 	corner2 = P(x20, y20, z10)
 	east_edge.block("East_Edge", material, color, corner1, corner2, "")
@@ -422,26 +3580,13 @@ class EastEdge(Part):
 	east_edge.simple_pocket("Stencil_Lock", corner1, corner2, radius, "")
 
 	# Drill the holes to join *north_edge*/*south_edge* to *east_edge*:
-	east_edge.fasten("NE_NE", stencil_frame.ne_ne_fastener_, "thread")
-	east_edge.fasten("NE_NW", stencil_frame.ne_nw_fastener_, "thread")
-	east_edge.fasten("NE_SE", stencil_frame.ne_se_fastener_, "thread")
-	east_edge.fasten("NE_SW", stencil_frame.ne_sw_fastener_, "thread")
-	east_edge.fasten("SE_NE", stencil_frame.se_ne_fastener_, "thread")
-	east_edge.fasten("SE_NW", stencil_frame.se_nw_fastener_, "thread")
-	east_edge.fasten("SE_SE", stencil_frame.se_se_fastener_, "thread")
-	east_edge.fasten("SE_SW", stencil_frame.se_sw_fastener_, "thread")
-
-	# Drill the holes to join *east_clamp* to *east_edge* (i.e. "ecee"):
-	east_edge.fasten("ECEE_NCE", stencil_frame.ecee_nce_fastener_, "thread")
-	east_edge.fasten("ECEE_NCW", stencil_frame.ecee_ncw_fastener_, "thread")
-	east_edge.fasten("ECEE_NE",  stencil_frame.ecee_ne_fastener_,  "thread")
-	east_edge.fasten("ECEE_NW",  stencil_frame.ecee_nw_fastener_,  "thread")
-	east_edge.fasten("ECEE_CE",  stencil_frame.ecee_ce_fastener_,  "thread")
-	east_edge.fasten("ECEE_CW",  stencil_frame.ecee_cw_fastener_,  "thread")
-	east_edge.fasten("ECEE_SCE", stencil_frame.ecee_sce_fastener_, "thread")
-	east_edge.fasten("ECEE_SCW", stencil_frame.ecee_scw_fastener_, "thread")
-	east_edge.fasten("ECEE_SW",  stencil_frame.ecee_se_fastener_,  "thread")
-	east_edge.fasten("ECEE_SE",  stencil_frame.ecee_sw_fastener_,  "thread")
+	east_edge.grid_fasten(stencil_frame.ne_grid, "thread")
+	east_edge.grid_fasten(stencil_frame.se_grid, "thread")
+
+	# Drill the holes to join *east_clamp* to *east_edge* (i.e. "ecee").  The labels of the
+	# "SE" and "SW" holes have always been swapped here:
+	east_edge.grid_fasten(stencil_frame.ecee_grid, "thread",
+	  labels={"ECEE_SE": "ECEE_SW", "ECEE_SW": "ECEE_SE"})
 
 	# Do any requested *debug* visualation operations:
 	if debug:
@@ -450,7 +3595,152 @@ class EastEdge(Part):
 	    corner2 = P(x20 + extra, y10, z10)
 	    east_edge.simple_pocket("Debug", corner1, corner2, radius, "t")
 
-class FrameEdge(Part):
+    def grids_get(self):
+	""" *EastEdge*: Return the *FastenerGrid*'s drilled by *EastEdge.construct_body*(). """
+
+	stencil_frame = self.up
+	return [stencil_frame.ne_grid, stencil_frame.se_grid, stencil_frame.ecee_grid]
+
+    def inputs_get(self):
+	""" *EastEdge*: Return the *Part*'s read by *EastEdge.construct_body*(). """
+
+	stencil_frame = self.up
+	return [stencil_frame, stencil_frame.east_clamp_, stencil_frame.stencil_]
+
+class ExactL(L):
+    """ *ExactL*: An *L* that also carries its exact rational length in millimeters.
+    """
+
+    def __init__(self, exact):
+	""" *ExactL*: Initialize the *ExactL* object (i.e. *self*) to *exact* millimeters (a
+	    *Fraction* or an integer.)
+	"""
+
+	exact_length = self
+	exact_length.exact = length_exact(exact)
+	L.__init__(exact_length, mm=float(exact_length.exact))
+
+    def __add__(self, length):
+	""" *ExactL*: Return the exact sum of the *ExactL* object (i.e. *self*) and *length*. """
+	return ExactL(self.exact + length_exact(length))
+
+    def __div__(self, divisor):
+	""" *ExactL*: Return the *ExactL* object (i.e. *self*) divided by the number *divisor*,
+	    or the float ratio of the two lengths when *divisor* is an *L*.
+	"""
+
+	if isinstance(divisor, L):
+	    return float(self.exact / length_exact(divisor))
+	return ExactL(self.exact / length_exact(divisor))
+
+    def __mul__(self, factor):
+	""" *ExactL*: Return the *ExactL* object (i.e. *self*) times the number *factor*. """
+	return ExactL(self.exact * length_exact(factor))
+
+    def __neg__(self):
+	""" *ExactL*: Return the negation of the *ExactL* object (i.e. *self*.) """
+	return ExactL(-self.exact)
+
+    def __radd__(self, length):
+	""" *ExactL*: Return the exact sum of *length* and the *ExactL* object (i.e. *self*.) """
+	return ExactL(length_exact(length) + self.exact)
+
+    def __rmul__(self, factor):
+	""" *ExactL*: Return the number *factor* times the *ExactL* object (i.e. *self*.) """
+	return ExactL(length_exact(factor) * self.exact)
+
+    def __rsub__(self, length):
+	""" *ExactL*: Return the exact difference of *length* and the *ExactL* object (i.e.
+	    *self*.)
+	"""
+
+	return ExactL(length_exact(length) - self.exact)
+
+    def __sub__(self, length):
+	""" *ExactL*: Return the exact difference of the *ExactL* object (i.e. *self*) and
+	    *length*.
+	"""
+
+	return ExactL(self.exact - length_exact(length))
+
+    __truediv__ = __div__
+
+class FastenerGrid:
+    """ *FastenerGrid*: Represents a grid of identical *Fastener*'s that are configured in one
+	batch.
+    """
+
+    def __init__(self, up, prefix, row_names, column_names):
+	""" *FastenerGrid*: Initialize the *FastenerGrid* object (i.e. *self*) by creating the
+	    *Fastener*'s for *row_names* by *column_names* in the assembly *up*.
+	"""
+
+	# Check argument types:
+	assert isinstance(up, Part)
+	assert isinstance(prefix, str) and not ' ' in prefix
+	assert isinstance(row_names, tuple)
+	assert isinstance(column_names, tuple)
+
+	# Create the *Fastener*'s in row major order:
+	grid = self
+	grid.column_names = column_names
+	grid.configure_key = None
+	grid.fasteners = []
+	grid.kind = None
+	grid.points = {}
+	grid.prefix = prefix
+	grid.row_names = row_names
+	for row_name in row_names:
+	    for column_name in column_names:
+		suffix = row_name + column_name
+		name = prefix + "_" + suffix
+		fastener = Fastener(up, name)
+		setattr(up, name.lower() + "_fastener_", fastener)
+		grid.fasteners.append((suffix, name, fastener))
+
+    def configure(self, axis, row_values, column_values, start, end, kind, ends=None):
+	""" *FastenerGrid*: Configure every *Fastener* in the *FastenerGrid* object (i.e. *self*)
+	    to be a *kind* screw.
+	"""
+
+	# Check argument types:
+	grid = self
+	ends = {} if ends == None else ends
+	assert axis in ("x", "z")
+	assert isinstance(row_values, tuple) and len(row_values) == len(grid.row_names)
+	assert isinstance(column_values, tuple) and len(column_values) == len(grid.column_names)
+	assert isinstance(start, L)
+	assert isinstance(end, L)
+	assert isinstance(kind, str)
+	assert isinstance(ends, dict)
+
+	# Skip everything when the values are the same as the previous pass:
+	millimeters = lambda lengths: tuple([length.millimeters() for length in lengths])
+	configure_key = (axis, millimeters(row_values), millimeters(column_values),
+	  start.millimeters(), end.millimeters(), kind,
+	  tuple(sorted([(suffix, ends[suffix].millimeters()) for suffix in ends])))
+	if configure_key == grid.configure_key:
+	    return
+
+	# Compute all of the start and end points and configure the *Fastener*'s:
+	index = 0
+	for row_value in row_values:
+	    for column_value in column_values:
+		suffix, name, fastener = grid.fasteners[index]
+		fastener_end = ends.get(suffix, end)
+		if axis == "z":
+		    start_point = P(column_value, row_value, start)
+		    end_point   = P(column_value, row_value, fastener_end)
+		else:
+		    start_point = P(start,        column_value, row_value)
+		    end_point   = P(fastener_end, column_value, row_value)
+		fastener.configure(start_point, end_point, kind)
+		grid.points[name] = (start_point, end_point)
+		index += 1
+	grid.kind = kind
+	grid.configure_key = configure_key
+
+class FrameEdge(BasePart):
     """ *FrameEdge*: Represents the north or south edge of the frame.
     """
 
@@ -464,13 +3754,14 @@ class FrameEdge(Part):
 	assert isinstance(is_north, bool)
 	assert isinstance(debug, bool)
 	frame_edge = self
-	Part.__init__(frame_edge, up, name)
+	BasePart.__init__(frame_edge, up, name)
 
 	# Stuff argument into *frame_edge*:
 	frame_edge.is_north_b = is_north
 	frame_edge.debug_b = debug
 
-    def construct(self):
+
+    def construct_body(self):
 	""" *FrameEdge*: Construct the *FrameEdge* object (i.e. *self*.)
 	"""
 
@@ -515,14 +3806,14 @@ class FrameEdge(Part):
 	z0  = east_edge_tne.z
 
 	# Create a block out of *material*:
-	material = Material("Plastic", "HDPE")
+	material = material_get("Plastic", "HDPE")
 	if is_north:
-	    color = Color("dark_green")
+	    color = color_get("dark_green")
 	    corner1 = P(x0,  y15, z0)
 	    corner2 = P(x40, y20, z10)
 	    comment = "North_Frame_Edge_Block"
 	else:
-	    color = Color("lime")
+	    color = color_get("lime")
 	    corner1 = P(x0,  y0, z0)
 	    corner2 = P(x40, y5, z10)
 	    comment = "South_Frame_Edge_Block"
@@ -537,63 +3828,103 @@ class FrameEdge(Part):
 
 	# Drill out the fastener holes:
 	if is_north:
-	    frame_edge.fasten("NE_NE", stencil_frame.ne_ne_fastener_, "close")
-	    frame_edge.fasten("NE_NW", stencil_frame.ne_nw_fastener_, "close")
-	    frame_edge.fasten("NE_SE", stencil_frame.ne_se_fastener_, "close")
-	    frame_edge.fasten("NE_SW", stencil_frame.ne_sw_fastener_, "close")
-	    frame_edge.fasten("NW_NE", stencil_frame.nw_ne_fastener_, "close")
-	    frame_edge.fasten("NW_NW", stencil_frame.nw_nw_fastener_, "close")
-	    frame_edge.fasten("NW_SE", stencil_frame.nw_se_fastener_, "close")
-	    frame_edge.fasten("NW_SW", stencil_frame.nw_sw_fastener_, "close")
+	    frame_edge.grid_fasten(stencil_frame.ne_grid, "close")
+	    frame_edge.grid_fasten(stencil_frame.nw_grid, "close")
 	else:
-	    frame_edge.fasten("SE_NE", stencil_frame.se_ne_fastener_, "close")
-	    frame_edge.fasten("SE_NW", stencil_frame.se_nw_fastener_, "close")
-	    frame_edge.fasten("SE_SE", stencil_frame.se_se_fastener_, "close")
-	    frame_edge.fasten("SE_SW", stencil_frame.se_sw_fastener_, "close")
-	    frame_edge.fasten("SW_NE", stencil_frame.sw_ne_fastener_, "close")
-	    frame_edge.fasten("SW_NW", stencil_frame.sw_nw_fastener_, "close")
-	    frame_edge.fasten("SW_SE", stencil_frame.sw_se_fastener_, "close")
-	    frame_edge.fasten("SW_SW", stencil_frame.sw_sw_fastener_, "close")
+	    frame_edge.grid_fasten(stencil_frame.se_grid, "close")
+	    frame_edge.grid_fasten(stencil_frame.sw_grid, "close")
 
 	corner_radius = L(inch="1/16")
 	frame_edge.rectangular_contour("Exterior_Contour", corner_radius)
 
-class Stencil(Part):
+    def grids_get(self):
+	""" *FrameEdge*: Return the *FastenerGrid*'s drilled by *FrameEdge.construct_body*(). """
+
+	frame_edge = self
+	stencil_frame = frame_edge.up
+	if frame_edge.is_north_b:
+	    return [stencil_frame.ne_grid, stencil_frame.nw_grid]
+	return [stencil_frame.se_grid, stencil_frame.sw_grid]
+
+    def inputs_get(self):
+	""" *FrameEdge*: Return the *Part*'s read by *FrameEdge.construct_body*(). """
+
+	stencil_frame = self.up
+	return [stencil_frame, stencil_frame.bottom_clamp_, stencil_frame.east_clamp_,
+	  stencil_frame.east_edge_, stencil_frame.west_edge_]
+
+class HoleFeature:
+    """ *HoleFeature*: One distinct hole (kind, mode and depth) with its drill, time and volume.
+    """
+
+    def __init__(self, kind, mode, depth):
+	""" *HoleFeature*: Initialize the *HoleFeature* object (i.e. *self*) for a *kind* hole
+	    (e.g. "#4-40") with *mode* ("close" or "thread") that is *depth* millimeters deep.
+	"""
+
+	# Check argument types:
+	assert isinstance(kind, str)
+	assert isinstance(mode, str)
+	assert isinstance(depth, float)
+
+	# Pick the drill and work out the time and the volume it removes:
+	hole_feature = self
+	hole_feature.kind     = kind
+	hole_feature.mode     = mode
+	hole_feature.depth    = depth
+	hole_feature.drill    = drills.get((kind, mode), "{0}_{1}_Drill".format(kind, mode))
+	hole_feature.diameter = drill_diameters.get(hole_feature.drill, 3.0)
+	hole_feature.cut_time = depth / drill_feed
+	hole_feature.volume   = math.pi * (hole_feature.diameter / 2.0) ** 2 * depth
+
+	# Name the feature with only letters, digits and underscores:
+	hole_feature.name = "".join([c if c.isalnum() else "_" for c in
+	  "hole_{0}_{1}_{2:.3f}".format(kind.lstrip("#"), mode, depth).replace(".", "p")])
+
+class Stencil(BasePart):
     """ *Stencil*: Represents the stencil to be mounted.
     """
 
-    def __init__(self, up, name, debug=False):
-	""" *Stencil*: Initialize the 
+    def __init__(self, up, name, dx, dy, thickness, fold_amount, debug=False):
+	""" *Stencil*: Initialize the *Stencil* object (i.e. *self*).
 	"""
 
 	# Standard initialization sequence:
 	assert isinstance(up, Part) or up == None
 	assert isinstance(name, str) and not ' ' in name
+	assert isinstance(dx, L)
+	assert isinstance(dy, L)
+	assert isinstance(thickness, L)
+	assert isinstance(fold_amount, L)
 	assert isinstance(debug, bool)
 	stencil = self
-	Part.__init__(stencil, up, name)
+	BasePart.__init__(stencil, up, name)
 
-	# Same *debug* into *stencil*:
-	stencil.debug_b = debug
+	# Stuff the arguments into *stencil*:
+	stencil.debug_b       = debug
+	stencil.fold_amount_l = fold_amount
+	stencil.sheet_dx_l    = dx
+	stencil.sheet_dy_l    = dy
+	stencil.thickness_l   = thickness
 
-    def construct(self):
+    def construct_body(self):
 	""" *Stencil*: Construct the *Stencil* object (i.e. *self*).
 	"""
 	
 	# Define some value and stuff them into *stencil* (i.e. *self*):
 	stencil = self
-	stencil.fold_amount_l = fold_amount = L(inch="1/4")
-	stencil.dx_l          = dx          = L(cm=15.00) - 2 * fold_amount
-	stencil.dy_l          = dy          = L(cm=10.00)
-	stencil.thickness_l   = thickness   = L(mm=0.12)
+	fold_amount           = stencil.fold_amount_l
+	thickness             = stencil.thickness_l
+	stencil.dx_l          = dx          = stencil.sheet_dx_l - 2 * fold_amount
+	stencil.dy_l          = dy          = stencil.sheet_dy_l
 
 	# Grab *debug* from *stencil*:
 	debug = stencil.debug_b
 
 	# Construct the main stencil:
 	#material = Material("Steel", "Stainless")
-	material = Material("Plastic", "HDPE")
-	color = Color("cyan")
+	material = material_get("Plastic", "HDPE")
+	color = color_get("cyan")
 	zero = L()
 	corner1 = P(-dx/2, -dy/2, zero)
 	corner2 = P( dx/2,  dy/2, -thickness)
@@ -615,12 +3946,23 @@ class Stencil(Part):
 	    corner2 = P( dx/2 + extra, -dy/2 - extra, zero)
 	    stencil.simple_pocket("Debug", corner1, corner2, L(inch="1/4"), "t")
 
-class StencilFrame(Part):
+    def grids_get(self):
+	""" *Stencil*: Return the *FastenerGrid*'s drilled by *Stencil.construct_body*(). """
+
+	return []
+
+    def inputs_get(self):
+	""" *Stencil*: Return the *Part*'s read by *Stencil.construct_body*(). """
+
+	return []
+
+class StencilFrame(BasePart):
     """ *StencilFrame*: Represents the entire Stencil frame assembly.
     """
 
-    def __init__(self, up, name, debug=False):
-	""" *StencilFrame*: Initialize the *StencilFrame* object (i.e. *self*.)
+    def __init__(self, up, name, stencil_dx, stencil_dy, stencil_thickness,
+      stencil_fold_amount, debug=False):
+	""" *StencilFrame*: Initialize the *StencilFrame* object (i.e. *self*).
 	"""
 
 	# Standard initialization sequequence:
@@ -628,11 +3970,12 @@ class StencilFrame(Part):
 	assert isinstance(name, str) and not ' ' in name
 	assert isinstance(debug, bool)
 	stencil_frame = self
-	Part.__init__(stencil_frame, up, name)
+	BasePart.__init__(stencil_frame, up, name)
 
 	# Save some values into *stencil_frame* (i.e. *self*):
 	stencil_frame.debug_b       = debug
-	stencil_frame.stencil_      = Stencil(stencil_frame,     "Stencil",           debug=debug)
+	stencil_frame.stencil_      = Stencil(stencil_frame,     "Stencil", stencil_dx, stencil_dy,
+	  stencil_thickness, stencil_fold_amount, debug=debug)
 	stencil_frame.east_edge_    = EastEdge(stencil_frame,    "East_Edge",         debug=debug)
 	stencil_frame.east_clamp_   = Clamp(stencil_frame,       "East_Clamp", True,  debug=debug)
 	stencil_frame.west_clamp_   = Clamp(stencil_frame,       "West_Clamp", False, debug=debug)
@@ -641,55 +3984,44 @@ class StencilFrame(Part):
 	stencil_frame.south_edge_   = FrameEdge(stencil_frame,   "South_Edge", False, debug=debug)
 	stencil_frame.west_edge_    = WestEdge(stencil_frame,    "West_Edge",         debug=debug)
 
-	# Create a whole bunch of fasteners:
-	stencil_frame.ne_ne_fastener_ = Fastener(stencil_frame, "NE_NE")
-	stencil_frame.ne_nw_fastener_ = Fastener(stencil_frame, "NE_NW")
-	stencil_frame.ne_se_fastener_ = Fastener(stencil_frame, "NE_SE")
-	stencil_frame.ne_sw_fastener_ = Fastener(stencil_frame, "NE_SW")
-	stencil_frame.nw_ne_fastener_ = Fastener(stencil_frame, "NW_NE")
-	stencil_frame.nw_nw_fastener_ = Fastener(stencil_frame, "NW_NW")
-	stencil_frame.nw_se_fastener_ = Fastener(stencil_frame, "NW_SE")
-	stencil_frame.nw_sw_fastener_ = Fastener(stencil_frame, "NW_SW")
-	stencil_frame.se_ne_fastener_ = Fastener(stencil_frame, "SE_NE")
-	stencil_frame.se_nw_fastener_ = Fastener(stencil_frame, "SE_NW")
-	stencil_frame.se_se_fastener_ = Fastener(stencil_frame, "SE_SE")
-	stencil_frame.se_sw_fastener_ = Fastener(stencil_frame, "SE_SW")
-	stencil_frame.sw_ne_fastener_ = Fastener(stencil_frame, "SW_NE")
-	stencil_frame.sw_nw_fastener_ = Fastener(stencil_frame, "SW_NW")
-	stencil_frame.sw_se_fastener_ = Fastener(stencil_frame, "SW_SE")
-	stencil_frame.sw_sw_fastener_ = Fastener(stencil_frame, "SW_SW")
-
-	# *west_clamp* and *bottom_clamp* fasteners:
-	stencil_frame.wcbc_cw_fastener_  = Fastener(stencil_frame, "WCBC_CW")
-	stencil_frame.wcbc_ce_fastener_  = Fastener(stencil_frame, "WCBC_CE")
-	stencil_frame.wcbc_nce_fastener_ = Fastener(stencil_frame, "WCBC_NCE")
-	stencil_frame.wcbc_ncw_fastener_ = Fastener(stencil_frame, "WCBC_NCW")
-	stencil_frame.wcbc_ne_fastener_  = Fastener(stencil_frame, "WCBC_NE")
-	stencil_frame.wcbc_nw_fastener_  = Fastener(stencil_frame, "WCBC_NW")
-	stencil_frame.wcbc_se_fastener_  = Fastener(stencil_frame, "WCBC_SE")
-	stencil_frame.wcbc_sw_fastener_  = Fastener(stencil_frame, "WCBC_SW")
-	stencil_frame.wcbc_sce_fastener_ = Fastener(stencil_frame, "WCBC_SCE")
-	stencil_frame.wcbc_scw_fastener_ = Fastener(stencil_frame, "WCBC_SCW")
-
-	# *east_clamp* and *east_edge* fasteners:
-	stencil_frame.ecee_ce_fastener_  = Fastener(stencil_frame, "ECEE_CE")
-	stencil_frame.ecee_cw_fastener_  = Fastener(stencil_frame, "ECEE_CW")
-	stencil_frame.ecee_nce_fastener_ = Fastener(stencil_frame, "ECEE_NCE")
-	stencil_frame.ecee_ncw_fastener_ = Fastener(stencil_frame, "ECEE_NCW")
-	stencil_frame.ecee_ne_fastener_  = Fastener(stencil_frame, "ECEE_NE")
-	stencil_frame.ecee_nw_fastener_  = Fastener(stencil_frame, "ECEE_NW")
-	stencil_frame.ecee_sce_fastener_ = Fastener(stencil_frame, "ECEE_SCE")
-	stencil_frame.ecee_scw_fastener_ = Fastener(stencil_frame, "ECEE_SCW")
-	stencil_frame.ecee_se_fastener_  = Fastener(stencil_frame, "ECEE_SE")
-	stencil_frame.ecee_sw_fastener_  = Fastener(stencil_frame, "ECEE_SW")
-
-	# Tension screws:
-	stencil_frame.webc_bn_fastener_ = Fastener(stencil_frame, "WEBC_BN")
-	stencil_frame.webc_bs_fastener_ = Fastener(stencil_frame, "WEBC_BS")
-	stencil_frame.webc_tn_fastener_ = Fastener(stencil_frame, "WEBC_TN")
-	stencil_frame.webc_ts_fastener_ = Fastener(stencil_frame, "WEBC_TS")
+	# The design parameters (see *--set* and *--sweep*):
+	stencil_frame.stock_thickness_l = L(inch=0.905)
 
-    def construct(self):
+	# Create the fastener grids (see *FastenerGrid*).  The 16 screws that bolt together the
+	# frame come in four quartets:
+	quartet_rows    = ("N", "S")
+	quartet_columns = ("E", "W")
+	stencil_frame.ne_grid = FastenerGrid(stencil_frame, "NE", quartet_rows, quartet_columns)
+	stencil_frame.nw_grid = FastenerGrid(stencil_frame, "NW", quartet_rows, quartet_columns)
+	stencil_frame.se_grid = FastenerGrid(stencil_frame, "SE", quartet_rows, quartet_columns)
+	stencil_frame.sw_grid = FastenerGrid(stencil_frame, "SW", quartet_rows, quartet_columns)
+
+	# *west_clamp* and *bottom_clamp* (i.e. "wcbc") and *east_clamp* and *east_edge* (i.e.
+	# "ecee") fasteners:
+	clamp_rows    = ("N", "NC", "C", "SC", "S")
+	clamp_columns = ("E", "W")
+	stencil_frame.wcbc_grid = FastenerGrid(stencil_frame, "WCBC", clamp_rows, clamp_columns)
+	stencil_frame.ecee_grid = FastenerGrid(stencil_frame, "ECEE", clamp_rows, clamp_columns)
+
+	# Tension screws that join *west_edge* to *bottom_clamp* (i.e. "webc"):
+	stencil_frame.webc_grid = FastenerGrid(stencil_frame, "WEBC", ("B", "T"), ("N", "S"))
+
+
+    def assembly_fingerprint_get(self):
+	""" *StencilFrame*: Return a fingerprint of the assembly view and fastener artifacts of
+	    the *StencilFrame* object (i.e. *self*.)
+	"""
+
+	import hashlib
+
+	# Hash the *Part* fingerprints in construction order:
+	stencil_frame = self
+	sha1 = hashlib.sha1()
+	for part in [stencil_frame] + stencil_frame.parts_get():
+	    sha1.update(part.fingerprint_get())
+	return sha1.hexdigest()
+
+    def construct_body(self):
 	""" *StencilFrame*: Construct the *StencilFrame* assembly (i.e. *self*.)
 	"""
                           
@@ -781,58 +4113,130 @@ class StencilFrame(Part):
 	z3  = west_edge_bsw.z + west_edge_dz/4
 	z0  = west_edge_bsw.z
 
-	# Save *stock_thickness* into *stencil_frame*:
-	stencil_frame.stock_thickness_l = L(inch=0.905)
+	# The 16 screws that bolt together the frame are four mirrored quartets:
+	for grid, row_values, column_values in (
+	  (stencil_frame.ne_grid, (y48, y46), (x48, x42)),
+	  (stencil_frame.nw_grid, (y48, y46), (x6,  x2)),
+	  (stencil_frame.se_grid, (y8,  y6),  (x48, x42)),
+	  (stencil_frame.sw_grid, (y8,  y6),  (x6,  x2))):
+	    grid.configure("z", row_values, column_values, z0, z20, "#4-40")
+
+	# The 10 screws that bolt the *west_clamp* and *bottom_clamp* (i.e. "wcbc") together.  The
+	# east column screws that land under the stencil are short:
+	stencil_frame.wcbc_grid.configure("z", (y28, y22, y20, y18, y12), (x17, x13), z0, z10,
+	  "#4-40", {"NCE": z4, "CE": z4, "SCE": z4})
+
+	# The 10 screws that bolt the *east_clamp* and *east_edge* (i.e. "ecee") together.  The
+	# west column screws that land under the stencil are short:
+	stencil_frame.ecee_grid.configure("z", (y28, y22, y20, y18, y12), (x48, x46), z0, z10,
+	  "#4-40", {"NCW": z4, "CW": z4, "SCW": z4})
+
+	# Fasteners for joining *west_edge* to *bottom_clamp* (i.e. "webc") run along X:
+	stencil_frame.webc_grid.configure("x", (z3, z7), (y25, y15), x0, x11, "#6-32")
+
+    def fastener_grids_get(self):
+	""" *StencilFrame*: Return the *FastenerGrid*'s of the *StencilFrame* object (i.e. *self*.)
+	"""
+
+	stencil_frame = self
+	return [stencil_frame.ne_grid, stencil_frame.nw_grid, stencil_frame.se_grid,
+	  stencil_frame.sw_grid, stencil_frame.wcbc_grid, stencil_frame.ecee_grid,
+	  stencil_frame.webc_grid]
+
+    def fastener_locate(self, fastener):
+	""" *StencilFrame*: Return the (*kind*, *start*, *end*) of *fastener* as last configured
+	    by its *FastenerGrid* or *None* if *fastener* is not in a *FastenerGrid*.
+	"""
+
+	# Search each *FastenerGrid* of *stencil_frame* (i.e. *self*):
+	stencil_frame = self
+	for grid in stencil_frame.fastener_grids_get():
+	    for suffix, name, grid_fastener in grid.fasteners:
+		if grid_fastener is fastener and name in grid.points:
+		    start, end = grid.points[name]
+		    return grid.kind, start, end
+	return None
+
+    def grid_inputs_get(self, grid):
+	""" *StencilFrame*: Return the *Part*'s whose values *construct_body*() reads to lay out
+	    *grid*, one of the *FastenerGrid*'s of the *StencilFrame* object (i.e. *self*.)
+	"""
+
+	# Check argument types:
+	stencil_frame = self
+	assert grid in stencil_frame.fastener_grids_get()
+
+	# The quartets take their rows from a frame edge, their columns from the *east_clamp*
+	# and *east_edge* or from the *west_edge*, and run from the *west_edge* bottom up to the
+	# *north_edge* top.  The clamp grids take their rows from the stencil and the gaps
+	# between it and the frame edges.  The "webc" screws run from the *west_edge* through
+	# to the *west_clamp*:
+	east_clamp = stencil_frame.east_clamp_
+	east_edge  = stencil_frame.east_edge_
+	north_edge = stencil_frame.north_edge_
+	south_edge = stencil_frame.south_edge_
+	stencil    = stencil_frame.stencil_
+	west_clamp = stencil_frame.west_clamp_
+	west_edge  = stencil_frame.west_edge_
+	if grid is stencil_frame.ne_grid:
+	    return [east_clamp, east_edge, north_edge, west_edge]
+	elif grid is stencil_frame.nw_grid:
+	    return [north_edge, west_edge]
+	elif grid is stencil_frame.se_grid:
+	    return [east_clamp, east_edge, north_edge, south_edge, west_edge]
+	elif grid is stencil_frame.sw_grid:
+	    return [north_edge, south_edge, west_edge]
+	elif grid is stencil_frame.wcbc_grid:
+	    return [north_edge, south_edge, stencil, west_clamp, west_edge]
+	elif grid is stencil_frame.ecee_grid:
+	    return [east_clamp, north_edge, south_edge, stencil, west_edge]
+	return [stencil, west_clamp, west_edge]
+
+    def parts_get(self):
+	""" *StencilFrame*: Return the sub-*Part*'s of the *StencilFrame* object (i.e. *self*)
+	    in construction order.
+	"""
+
+	stencil_frame = self
+	return [stencil_frame.stencil_, stencil_frame.east_edge_, stencil_frame.east_clamp_,
+	  stencil_frame.west_clamp_, stencil_frame.bottom_clamp_, stencil_frame.north_edge_,
+	  stencil_frame.south_edge_, stencil_frame.west_edge_]
 
-	# The 16 screws that bolt together the frame:
-	stencil_frame.ne_ne_fastener_.configure(P(x48, y48, z0), P(x48, y48, z20), "#4-40")
-	stencil_frame.ne_nw_fastener_.configure(P(x42, y48, z0), P(x42, y48, z20), "#4-40")
-	stencil_frame.ne_se_fastener_.configure(P(x48, y46, z0), P(x48, y46, z20), "#4-40")
-	stencil_frame.ne_sw_fastener_.configure(P(x42, y46, z0), P(x42, y46, z20), "#4-40")
-	stencil_frame.nw_ne_fastener_.configure(P(x6,  y48, z0), P(x6,  y48, z20), "#4-40")
-	stencil_frame.nw_nw_fastener_.configure(P(x2,  y48, z0), P(x2,  y48, z20), "#4-40")
-	stencil_frame.nw_se_fastener_.configure(P(x6,  y46, z0), P(x6,  y46, z20), "#4-40")
-	stencil_frame.nw_sw_fastener_.configure(P(x2,  y46, z0), P(x2,  y46, z20), "#4-40")
-	stencil_frame.se_ne_fastener_.configure(P(x48, y8,  z0), P(x48, y8,  z20), "#4-40")
-	stencil_frame.se_nw_fastener_.configure(P(x42, y8,  z0), P(x42, y8,  z20), "#4-40")
-	stencil_frame.se_se_fastener_.configure(P(x48, y6,  z0), P(x48, y6,  z20), "#4-40")
-	stencil_frame.se_sw_fastener_.configure(P(x42, y6,  z0), P(x42, y6,  z20), "#4-40")
-	stencil_frame.sw_ne_fastener_.configure(P(x6,  y8,  z0), P(x6,  y8,  z20), "#4-40")
-	stencil_frame.sw_nw_fastener_.configure(P(x2,  y8,  z0), P(x2,  y8,  z20), "#4-40")
-	stencil_frame.sw_se_fastener_.configure(P(x6,  y6,  z0), P(x6,  y6,  z20), "#4-40")
-	stencil_frame.sw_sw_fastener_.configure(P(x2,  y6,  z0), P(x2,  y6,  z20), "#4-40")
-        
-	# The 8 screws that bolt the *west_clamp* and *bottom_clamp* (i.e. "wcbc") together:
-	stencil_frame.wcbc_ce_fastener_.configure(P(x17,  y20, z0), P(x17, y20, z4),  "#4-40")
-	stencil_frame.wcbc_cw_fastener_.configure(P(x13,  y20, z0), P(x13, y20, z10), "#4-40")
-	stencil_frame.wcbc_nce_fastener_.configure(P(x17, y22, z0), P(x17, y22, z4),  "#4-40")
-	stencil_frame.wcbc_ncw_fastener_.configure(P(x13, y22, z0), P(x13, y22, z10), "#4-40")
-	stencil_frame.wcbc_ne_fastener_.configure(P(x17,  y28, z0), P(x17, y28, z10), "#4-40")
-	stencil_frame.wcbc_nw_fastener_.configure(P(x13,  y28, z0), P(x13, y28, z10), "#4-40")
-	stencil_frame.wcbc_sce_fastener_.configure(P(x17, y18, z0), P(x17, y18, z4),  "#4-40")
-	stencil_frame.wcbc_scw_fastener_.configure(P(x13, y18, z0), P(x13, y18, z10), "#4-40")
-	stencil_frame.wcbc_se_fastener_.configure(P(x17,  y12, z0), P(x17, y12, z10), "#4-40")
-	stencil_frame.wcbc_sw_fastener_.configure(P(x13,  y12, z0), P(x13, y12, z10), "#4-40")
-
-	# The 8 screws that bolt the *east_clamp* and *east_edge* (i.e. "ecee") together:
-	stencil_frame.ecee_ce_fastener_.configure(P(x48,  y20, z0), P(x48, y20, z10), "#4-40")
-	stencil_frame.ecee_cw_fastener_.configure(P(x46,  y20, z0), P(x46, y20, z4),  "#4-40")
-	stencil_frame.ecee_nce_fastener_.configure(P(x48, y22, z0), P(x48, y22, z10), "#4-40")
-	stencil_frame.ecee_ncw_fastener_.configure(P(x46, y22, z0), P(x46, y22, z4),  "#4-40")
-	stencil_frame.ecee_ne_fastener_.configure(P(x48,  y28, z0), P(x48, y28, z10), "#4-40")
-	stencil_frame.ecee_nw_fastener_.configure(P(x46,  y28, z0), P(x46, y28, z10), "#4-40")
-	stencil_frame.ecee_sce_fastener_.configure(P(x48, y18, z0), P(x48, y18, z10), "#4-40")
-	stencil_frame.ecee_scw_fastener_.configure(P(x46, y18, z0), P(x46, y18, z4),  "#4-40")
-	stencil_frame.ecee_se_fastener_.configure(P(x48,  y12, z0), P(x48, y12, z10), "#4-40")
-	stencil_frame.ecee_sw_fastener_.configure(P(x46,  y12, z0), P(x46, y12, z10), "#4-40")
-
-	# Fasteners for joining *west_edge* to *bottom_clamp* (i.e. "webc"):
-	stencil_frame.webc_bn_fastener_.configure(P(x0, y25, z3), P(x11, y25, z3), "#6-32")
-	stencil_frame.webc_bs_fastener_.configure(P(x0, y15, z3), P(x11, y15, z3), "#6-32")
-	stencil_frame.webc_tn_fastener_.configure(P(x0, y25, z7), P(x11, y25, z7), "#6-32")
-	stencil_frame.webc_ts_fastener_.configure(P(x0, y15, z7), P(x11, y15, z7), "#6-32")
-
-class WestEdge(Part):
+class TracedContour(Contour):
+    """ *TracedContour*: A *Contour* that also remembers its bend points so that the length of
+	its path can be estimated without EZCAD3 (see *BasePart.estimate_get*()).
+    """
+
+    def __init__(self, name):
+	""" *TracedContour*: Initialize the *TracedContour* object (i.e. *self*.)
+	"""
+
+	# Initialize the *Contour* and start with no bend points:
+	traced_contour = self
+	Contour.__init__(traced_contour, name)
+	traced_contour.bend_points = []
+
+    def bend_append(self, name, point, radius, *arguments):
+	""" *TracedContour*: Append the bend *name* at *point* with *radius* to the
+	    *TracedContour* object (i.e. *self*.)
+	"""
+
+	# Remember the point and pass the bend on to *Contour*:
+	traced_contour = self
+	traced_contour.bend_points.append((point.x.millimeters(), point.y.millimeters()))
+	Contour.bend_append(traced_contour, name, point, radius, *arguments)
+
+    def length_get(self):
+	""" *TracedContour*: Return the length in millimeters of the closed path through the bend
+	    points of the *TracedContour* object (i.e. *self*.)  The bend radii are ignored.
+	"""
+
+	# Sum up the distances between the bend points (wrapping around at the end):
+	points = self.bend_points
+	return sum([math.hypot(points[index][0] - points[index - 1][0],
+	  points[index][1] - points[index - 1][1]) for index in range(len(points))])
+
+class WestEdge(BasePart):
     """ *WestEdge*: Represents the west edge of the frame.
     """
 
@@ -845,10 +4249,10 @@ class WestEdge(Part):
 	assert isinstance(name, str) and not ' ' in name
 	assert isinstance(debug, bool)
 	west_edge = self
-	Part.__init__(west_edge, up, name)
+	BasePart.__init__(west_edge, up, name)
 	west_edge.debug_b = debug
 
-    def construct(self):
+    def construct_body(self):
 	""" *WestEdge*: Construct the *WestEdge* object (i.e. *self*.) """
 
 	# Grab some *Part*'s from *west_edge* (i.e. *self*):
@@ -883,8 +4287,8 @@ class WestEdge(Part):
 	z0  = east_edge_bsw.z
 
 	# Start with a block of *material*:
-	material = Material("Plastic", "HDPE")
-	color = Color("yellow")
+	material = material_get("Plastic", "HDPE")
+	color = color_get("yellow")
 	corner1 = P(x0,  y0,  z0)
 	corner2 = P(x20, y20, z20)
 	west_edge.block("West_Edge_Block", material, color, corner1, corner2, "")
@@ -900,21 +4304,25 @@ class WestEdge(Part):
 	west_edge.rectangular_contour("Exterior_Contour", corner_radius)
 
 	# Drill out the fastener holes:
-	west_edge.fasten("NW_NE", stencil_frame.nw_ne_fastener_, "thread")
-	west_edge.fasten("NW_NW", stencil_frame.nw_nw_fastener_, "thread")
-	west_edge.fasten("NW_SE", stencil_frame.nw_se_fastener_, "thread")
-	west_edge.fasten("NW_SW", stencil_frame.nw_sw_fastener_, "thread")
-	west_edge.fasten("SW_NE", stencil_frame.sw_ne_fastener_, "thread")
-	west_edge.fasten("SW_NW", stencil_frame.sw_nw_fastener_, "thread")
-	west_edge.fasten("SW_SE", stencil_frame.sw_se_fastener_, "thread")
-	west_edge.fasten("SW_SW", stencil_frame.sw_sw_fastener_, "thread")
+	west_edge.grid_fasten(stencil_frame.nw_grid, "thread")
+	west_edge.grid_fasten(stencil_frame.sw_grid, "thread")
 
 	# Remount with west edge facing up:
 	west_edge.vice_mount("West_Vice", "w", "b", "l", zero, zero)
-	west_edge.fasten("WEBC_BN", stencil_frame.webc_bn_fastener_, "close")
-	west_edge.fasten("WEBC_BS", stencil_frame.webc_bs_fastener_, "close") 
-	west_edge.fasten("WEBC_TN", stencil_frame.webc_tn_fastener_, "close")
-	west_edge.fasten("WEBC_TS", stencil_frame.webc_ts_fastener_, "close")
+	west_edge.grid_fasten(stencil_frame.webc_grid, "close")
+
+    def grids_get(self):
+	""" *WestEdge*: Return the *FastenerGrid*'s drilled by *WestEdge.construct_body*(). """
+
+	stencil_frame = self.up
+	return [stencil_frame.nw_grid, stencil_frame.sw_grid, stencil_frame.webc_grid]
+
+    def inputs_get(self):
+	""" *WestEdge*: Return the *Part*'s read by *WestEdge.construct_body*(). """
+
+	stencil_frame = self.up
+	return [stencil_frame.bottom_clamp_, stencil_frame.east_edge_, stencil_frame.north_edge_,
+	  stencil_frame.south_edge_]
 
 if __name__ == "__main__":
     main()
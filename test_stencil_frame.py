@@ -0,0 +1,288 @@
+# Tests for stencil_frame.py.  stencil_frame.py imports EZCAD3 (for *L*, *P*, *Part*, etc.), so
+# every test is skipped where EZCAD3 is not installed.  Run them with:
+#
+#        python -m pytest -q test_stencil_frame.py
+
+import fractions
+import math
+import pytest
+
+pytest.importorskip("EZCAD3")
+
+import stencil_frame
+from EZCAD3 import L, P
+
+def frame_solve(*arguments):
+    """ Return a *StencilFrame* created from the command line *arguments* and solved offline.
+    """
+
+    options = stencil_frame.options_parse(list(arguments))
+    frame = stencil_frame.frame_create(options)
+    stencil_frame.frame_offline_solve(frame)
+    return frame
+
+def fingerprints_get(frame):
+    """ Return a dictionary from each *Part* name of *frame* to its fingerprint. """
+
+    return dict([(part.part_name, part.fingerprint_get()) for part in frame.parts_get()])
+
+def test_value_canonical_is_stable_to_a_micron():
+    point = P(L(mm=1.0), L(inch=1.0), L())
+    assert stencil_frame.value_canonical(point) == "P(1.000000mm,25.400000mm,0.000000mm)"
+    assert (stencil_frame.value_canonical({"b": [point, 2], "a": None}) ==
+      stencil_frame.value_canonical({"a": None, "b": (point, 2)}))
+    assert stencil_frame.value_canonical(L(mm=1.0)) != stencil_frame.value_canonical(L(mm=1.001))
+
+def test_build_cache_only_trusts_present_artifacts(tmpdir):
+    artifact = tmpdir.join("Stencil.wrl")
+    artifact.write("")
+    cache_path = str(tmpdir.join("cache.json"))
+    build_cache = stencil_frame.BuildCache(cache_path)
+    build_cache.record("Stencil", "1234", [str(artifact)])
+    build_cache.save()
+
+    # A reloaded cache is fresh for the same fingerprint until the artifact goes missing:
+    build_cache = stencil_frame.BuildCache(cache_path)
+    assert build_cache.is_fresh("Stencil", "1234")
+    assert not build_cache.is_fresh("Stencil", "5678")
+    assert not build_cache.is_fresh("West_Edge", "1234")
+    artifact.remove()
+    assert not build_cache.is_fresh("Stencil", "1234")
+
+def test_artifacts_merge_gives_the_fasteners_to_the_assembly(tmpdir):
+    scratch = tmpdir.mkdir("scratch")
+    for path in ("StencilFrame.wrl", "Stencil.wrl", "WestClamp.wrl", "Fastener4_40.wrl"):
+        scratch.mkdir(path[:-4]).join(path).write(path)
+    output = tmpdir.mkdir("output")
+    names = ["Stencil", "West_Clamp", "Stencil_Frame"]
+    artifacts = stencil_frame.artifacts_merge(str(scratch), str(output), names,
+      ["Stencil_Frame", "West_Clamp"])
+    assert artifacts == {"Stencil_Frame": ["Fastener4_40/Fastener4_40.wrl",
+      "StencilFrame/StencilFrame.wrl"], "West_Clamp": ["WestClamp/WestClamp.wrl"]}
+    assert not output.join("Stencil").check()
+
+def path_length(points, order):
+    """ Return the length of the open path through *points* in *order*. """
+
+    return sum([math.hypot(points[order[index + 1]][0] - points[order[index]][0],
+      points[order[index + 1]][1] - points[order[index]][1]) for index in range(len(order) - 1)])
+
+def test_path_order_leaves_no_two_opt_move():
+    points = [(0, 0), (10, 0), (1, 0), (11, 0), (2, 0), (5, 7), (3, 9), (8, 2)]
+    order = stencil_frame.path_order(points)
+    assert order[0] == 0 and sorted(order) == range(len(points))
+    assert stencil_frame.path_order([(0, 0), (10, 0), (1, 0), (11, 0), (2, 0)]) == [0, 2, 4, 1, 3]
+
+    # Reversing any stretch of the path does not shorten it:
+    length = path_length(points, order)
+    for low in range(1, len(order)):
+        for high in range(low + 1, len(order)):
+            reversed_order = order[:low] + order[low:high + 1][::-1] + order[high + 1:]
+            assert path_length(points, reversed_order) >= length - 1.0e-9
+
+def test_schedule_only_reorders_the_operations():
+    source_frame = frame_solve()
+    schedule_frame = frame_solve("--schedule")
+    reordered = 0
+    for source_part, schedule_part in zip(source_frame.parts_get(), schedule_frame.parts_get()):
+        source = [stencil_frame.value_canonical(operation) for operation in source_part.operations]
+        schedule = [stencil_frame.value_canonical(operation)
+          for operation in schedule_part.operations]
+        assert sorted(source) == sorted(schedule), source_part.part_name
+        reordered += source != schedule
+    assert reordered > 0
+
+def pocket_clip(part, top_face, low, high):
+    """ Return the *part*.*pocket_clip*() of a pocket from *low* to *high* (in millimeters)
+        cut from the *top_face* ("t", "b", etc.) of the current vice mount.
+    """
+
+    part.operations = [("vice_mount", ("Vice", top_face, "w", "l"))]
+    arguments = ("Pocket", P(L(mm=low[0]), L(mm=low[1]), L(mm=low[2])),
+      P(L(mm=high[0]), L(mm=high[1]), L(mm=high[2])), L(mm=1.0), "")
+    return part.pocket_clip(arguments)
+
+def test_pocket_clip_enters_from_the_setup_top_face():
+    part = stencil_frame.Clamp(None, "West_Clamp", False)
+
+    # From the bottom, the second pocket enters where the first one stopped:
+    assert pocket_clip(part, "b", (0, 0, 0), (10, 10, 5)) != None
+    clipped = pocket_clip(part, "b", (0, 0, 0), (10, 10, 8))
+    assert [clipped[1].z.millimeters(), clipped[2].z.millimeters()] == [5.0, 8.0]
+
+    # From the top, the same pockets already cleared everything up to 8mm:
+    assert pocket_clip(part, "t", (2, 2, 3), (8, 8, 8)) == None
+
+    # A pocket cut along another axis does not line up with them:
+    arguments = pocket_clip(part, "n", (2, 0, 2), (8, 10, 4))
+    assert [arguments[1].y.millimeters(), arguments[2].y.millimeters()] == [0.0, 10.0]
+
+def test_fingerprints_are_stable():
+    assert fingerprints_get(frame_solve()) == fingerprints_get(frame_solve())
+
+def test_baseline_fastener_coordinates():
+    frame = frame_solve()
+    counts = dict([(grid_name, (len(getattr(frame, grid_name + "_grid").points),
+      getattr(frame, grid_name + "_grid").kind))
+      for grid_name in ("ne", "nw", "se", "sw", "wcbc", "ecee", "webc")])
+    assert counts == {"ne": (4, "#4-40"), "nw": (4, "#4-40"), "se": (4, "#4-40"),
+      "sw": (4, "#4-40"), "wcbc": (10, "#4-40"), "ecee": (10, "#4-40"), "webc": (4, "#6-32")}
+
+    # Spot check the start and end of one fastener per grid (and the short clamp screws):
+    expected = [
+      ("ne", "NE_NE", (73.412, 81.750, -11.493), (73.412, 81.750, 34.480)),
+      ("nw", "NW_NW", (-140.088, 81.750, -11.493), (-140.088, 81.750, 34.480)),
+      ("se", "SE_NE", (73.412, -69.050, -11.493), (73.412, -69.050, 34.480)),
+      ("sw", "SW_NE", (-124.213, -69.050, -11.493), (-124.213, -69.050, 34.480)),
+      ("wcbc", "WCBC_CE", (-63.888, 0.0, -11.493), (-63.888, 0.0, -0.120)),
+      ("wcbc", "WCBC_CW", (-73.412, 0.0, -11.493), (-73.412, 0.0, 11.493)),
+      ("ecee", "ECEE_CE", (73.412, 0.0, -11.493), (73.412, 0.0, 11.493)),
+      ("ecee", "ECEE_CW", (63.888, 0.0, -11.493), (63.888, 0.0, -0.120)),
+      ("webc", "WEBC_BN", (-148.025, 50.0, -5.747), (-78.175, 50.0, -5.747)),
+      ("webc", "WEBC_BS", (-148.025, -50.0, -5.747), (-78.175, -50.0, -5.747))]
+    for grid_name, name, start, end in expected:
+        points = getattr(frame, grid_name + "_grid").points[name]
+        for point, values in zip(points, (start, end)):
+            coordinates = (point.x.millimeters(), point.y.millimeters(), point.z.millimeters())
+            assert coordinates == pytest.approx(values, abs=0.001), name
+
+def test_baseline_hole_labels():
+    frame = frame_solve()
+    labels = lambda part: dict([(arguments[0], arguments[1])
+      for name, arguments in part.operations if name == "fasten"])
+    bottom_clamp_labels = labels(frame.bottom_clamp_)
+    assert bottom_clamp_labels["WCBC_BN"] is frame.webc_bn_fastener_
+    assert not "WEBC_BN" in bottom_clamp_labels
+    east_edge_labels = labels(frame.east_edge_)
+    assert east_edge_labels["ECEE_SW"] is frame.ecee_se_fastener_
+    assert east_edge_labels["ECEE_SE"] is frame.ecee_sw_fastener_
+
+def test_nest_pack_fills_the_plate_shelf_by_shelf():
+    plates = stencil_frame.nest_pack([("a", 100, 50), ("b", 100, 50), ("c", 250, 10)],
+      300, 100, 5, 5)
+    assert plates == [[("a", 0.0, 0.0, False), ("b", 105, 0.0, False), ("c", 0.0, 55.0, False)]]
+
+def test_nest_places_every_cut_part_once(tmpdir, monkeypatch):
+    monkeypatch.chdir(tmpdir)
+    options = stencil_frame.options_parse(["--outputs", "nest"])
+    stencil_frame.frame_nest(frame_solve("--outputs", "nest"), options)
+    lines = "".join([path.read() for path in tmpdir.join("nest").listdir("plate_*.txt")])
+    names = sorted([line.split(" ")[0] for line in lines.splitlines()])
+    assert names == ["Bottom_Clamp", "East_Clamp", "East_Edge", "North_Edge", "South_Edge",
+      "West_Clamp", "West_Edge"]
+
+def test_assembly_fingerprint_covers_every_part():
+    before = frame_solve()
+    after = frame_solve("--set", "East_Clamp.extra_dy=0.75in")
+    assert before.assembly_fingerprint_get() == frame_solve().assembly_fingerprint_get()
+    assert before.assembly_fingerprint_get() != after.assembly_fingerprint_get()
+
+def test_closure_follows_the_grids_that_a_part_drills():
+    frame = frame_solve()
+    assert stencil_frame.frame_closure(frame, ["Stencil"]) == ["Stencil"]
+
+    # The "wcbc" rows sit between the stencil and the north and south edges:
+    assert frame.grid_inputs_get(frame.wcbc_grid) == [frame.north_edge_, frame.south_edge_,
+      frame.stencil_, frame.west_clamp_, frame.west_edge_]
+    closure = stencil_frame.frame_closure(frame, ["West_Clamp"])
+    for name in ("North_Edge", "South_Edge", "Stencil_Frame", "West_Edge"):
+        assert name in closure, name
+
+def test_box_tree_finds_only_the_overlapping_boxes():
+    box_tree = stencil_frame.BoxTree([((0, 0, 0), (1, 1, 1), "a"), ((5, 5, 5), (6, 6, 6), "b"),
+      ((0.5, 0.5, 0.5), (2, 2, 2), "c")])
+    assert sorted(box_tree.query((0.9, 0.9, 0.9), (1.5, 1.5, 1.5))) == [0, 2]
+    assert box_tree.query((3, 3, 3), (4, 4, 4)) == []
+
+def test_default_frame_has_no_unexplained_overlaps(capsys):
+    stencil_frame.frame_clearance_report(frame_solve())
+    lines = capsys.readouterr()[0].splitlines()
+    assert lines[-1].endswith(" 0 clearances under 1.00mm")
+
+    # Every overlap is followed by the contours that may cut it away:
+    for index, line in enumerate(lines):
+        if line.startswith("Overlap:"):
+            assert lines[index + 1].strip().startswith("(unless cut away by"), line
+
+def test_fingerprints_follow_moved_fasteners():
+    # Move every fastener that joins *west_clamp* to *bottom_clamp* 5mm north:
+    frame = frame_solve()
+    before = fingerprints_get(frame)
+    grid = frame.wcbc_grid
+    five = L(mm=5.0)
+    for name, (start, end) in grid.points.items():
+        grid.points[name] = (P(start.x, start.y + five, start.z), P(end.x, end.y + five, end.z))
+    after = fingerprints_get(frame)
+
+    # Only the two *Part*'s that the grid joins change:
+    changed = sorted([name for name in before if before[name] != after[name]])
+    assert changed == ["Bottom_Clamp", "West_Clamp"]
+
+def test_fingerprints_follow_design_parameters():
+    # *extra_dy* moves the WCBC holes of *west_clamp* and *bottom_clamp* too:
+    before = fingerprints_get(frame_solve())
+    after = fingerprints_get(frame_solve("--set", "East_Clamp.extra_dy=0.75in"))
+    for name in ("Bottom_Clamp", "East_Clamp", "West_Clamp"):
+        assert before[name] != after[name], name
+    assert before["Stencil"] == after["Stencil"]
+
+def test_bar_pack_uses_the_fewest_bars():
+    bars = stencil_frame.bar_pack([("a", 60), ("b", 50), ("c", 30)], 100, 3)
+    assert bars == [[("a", 0.0), ("c", 63)], [("b", 0.0)]]
+
+def test_bom_counts_the_screws_and_holes(capsys):
+    bom = ([], {}, {})
+    stencil_frame.frame_bom_collect(frame_solve(), "", 1, bom)
+    pieces, screws, holes = bom
+    assert len(pieces) == 7 and "Stencil#1" not in [piece[0] for piece in pieces]
+    assert screws == {("#4-40", 0.5): 6, ("#4-40", 1.0): 14, ("#4-40", 1.875): 16,
+      ("#6-32", 2.75): 4}
+    assert holes == {("#4-40", "close"): 30, ("#4-40", "thread"): 36,
+      ("#6-32", "close"): 4, ("#6-32", "thread"): 4}
+    stencil_frame.bom_report(bom, stencil_frame.options_parse(["--outputs", "bom"]))
+    assert "Saw time:" in capsys.readouterr()[0]
+
+def test_exact_lengths_do_not_round():
+    tenth = stencil_frame.ExactL(fractions.Fraction(1, 10))
+    assert (tenth * 3 - stencil_frame.ExactL(fractions.Fraction(3, 10))).exact == 0
+    assert (-tenth + tenth).exact == 0
+    assert stencil_frame.length_exact(L(inch=0.001)) == fractions.Fraction(127, 5000)
+
+def test_hole_features_are_shared():
+    hole_feature = stencil_frame.hole_feature_get("#4-40", "thread", 22.987)
+    assert hole_feature is stencil_frame.hole_feature_get("#4-40", "thread", 22.9871)
+    assert hole_feature.name == "hole_4_40_thread_22p987"
+
+def test_nest_wraps_tooling_plate_programs(tmpdir, monkeypatch):
+    # Pretend that EZCAD3 wrote the *west_clamp* tooling plate program:
+    monkeypatch.chdir(tmpdir)
+    tmpdir.mkdir("ngc").join("O10002.ngc").write(
+      "%\n( West_Clamp: Plate_Mount )\nG20 G90\nG54\nG0 X1 Y1\nM30\n%\n")
+    options = stencil_frame.options_parse(["--outputs", "nest"])
+    frame = frame_solve("--outputs", "nest")
+    stencil_frame.frame_nest(frame, options)
+
+    # The plate program calls the subroutine that wraps the program, minus its end and G54:
+    plates = "".join([path.read() for path in tmpdir.join("nest").listdir("plate_*.ngc")])
+    assert "o<west_clamp_plate_mount> call\n" in plates
+    assert tmpdir.join("nest", "west_clamp_plate_mount.ngc").read() == (
+      "( West_Clamp Plate_Mount from ngc/O10002.ngc )\n"
+      "o<west_clamp_plate_mount> sub\n"
+      "( West_Clamp: Plate_Mount )\nG20 G90\nG0 X1 Y1\n"
+      "o<west_clamp_plate_mount> endsub\nM2\n")
+
+def test_program_line_strip_matches_whole_words_outside_of_comments():
+    strip = stencil_frame.program_line_strip
+    assert strip("G20 G054 G90\n") == ("G20 G90", 0)
+    assert strip("G0G59.1X1") == ("G0X1", 0)
+    assert strip("N10 M02") == ("N10", 1) and strip("M30") == ("", 1)
+    assert strip("M3 S1000 G540 M300") == ("M3 S1000 G540 M300", 0)
+    assert strip("G55 (G54 and M2 stay) ; M30 too") == ("(G54 and M2 stay) ; M30 too", 0)
+    assert strip("o<sub_m2> call") == ("o<sub_m2> call", 0)
+
+def test_nest_fails_on_a_program_without_an_end(tmpdir, monkeypatch):
+    monkeypatch.chdir(tmpdir)
+    tmpdir.mkdir("ngc").join("O10002.ngc").write("( West_Clamp: Plate_Mount )\nG0 X1 Y1\n")
+    options = stencil_frame.options_parse(["--outputs", "nest"])
+    with pytest.raises(AssertionError):
+        stencil_frame.frame_nest(frame_solve("--outputs", "nest"), options)